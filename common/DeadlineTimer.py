@@ -0,0 +1,83 @@
+import threading
+import time
+
+# 距截止时间小于该值时改为让出式忙等，以获得亚毫秒精度
+SPIN_THRESHOLD_NS = 200_000
+# 长于该值的等待先在 Event 上可中断地睡眠；Event.wait 的超时精度不如
+# time.sleep（Windows 上约为系统时钟周期），最后这一段仍用 time.sleep
+INTERRUPTIBLE_MARGIN_NS = 20_000_000
+
+
+class DeadlineTimer:
+    """基于 time.perf_counter_ns() 的绝对截止时间调度。
+
+    第 k 个周期的截止时间固定为 start + k * period，处理耗时不会累积成漂移；
+    周期以浮点纳秒保存，非整数毫秒的周期也不会被截断。错过一个或多个
+    截止时间时跳过相应周期并计入 missed；每次唤醒相对截止时间的延迟
+    记入 max_lateness_ns 和均方根抖动 rms_lateness_ns()。
+    其他线程调用 interrupt() 可以让正在进行的 wait() 立即返回，低速率时
+    停止输出不必等满一个周期。
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.period_ns = 1e9 / rate
+        self.interrupted = threading.Event()
+        self.reset()
+
+    def reset(self):
+        self.interrupted.clear()
+        self.start_ns = time.perf_counter_ns()
+        self.ticks = 0
+        self.missed = 0
+        self.max_lateness_ns = 0
+        self.waits = 0
+        self.lateness_sq_sum = 0.0
+
+    def set_rate(self, rate):
+        """修改速率，从当前时刻重新对齐截止时间，统计数据保留"""
+        self.rate = rate
+        self.period_ns = 1e9 / rate
+        self.start_ns = time.perf_counter_ns()
+        self.ticks = 0
+
+    def interrupt(self):
+        """让当前及之后的 wait() 立即返回，直到 reset()"""
+        self.interrupted.set()
+
+    def deadline_ns(self, ticks):
+        return self.start_ns + round(ticks * self.period_ns)
+
+    def wait(self):
+        """阻塞到下一个截止时间，返回该截止时间（ns）；interrupt() 后提前返回"""
+        self.ticks += 1
+        deadline = self.deadline_ns(self.ticks)
+        now = time.perf_counter_ns()
+        if now - deadline >= self.period_ns:
+            # 已错过整周期：跳过这些周期，不做补偿性的连续采样
+            skipped = int((now - deadline) // self.period_ns)
+            self.missed += skipped
+            self.ticks += skipped
+            deadline = self.deadline_ns(self.ticks)
+
+        remaining = deadline - now
+        if remaining > INTERRUPTIBLE_MARGIN_NS:
+            if self.interrupted.wait((remaining - INTERRUPTIBLE_MARGIN_NS) / 1e9):
+                return deadline
+            remaining = deadline - time.perf_counter_ns()
+        if remaining > SPIN_THRESHOLD_NS:
+            time.sleep((remaining - SPIN_THRESHOLD_NS) / 1e9)
+        while time.perf_counter_ns() < deadline:
+            if self.interrupted.is_set():
+                return deadline
+            time.sleep(0)  # 让出 GIL，避免忙等阻塞界面线程
+
+        lateness = time.perf_counter_ns() - deadline
+        if lateness > self.max_lateness_ns:
+            self.max_lateness_ns = lateness
+        self.waits += 1
+        self.lateness_sq_sum += float(lateness) * lateness
+        return deadline
+
+    def rms_lateness_ns(self):
+        return (self.lateness_sq_sum / self.waits) ** 0.5 if self.waits else 0.0
@@ -0,0 +1,100 @@
+import time
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+
+DEFAULT_FPS = 30
+MIN_FPS = 5
+# 一帧的绘制耗时（滑动平均）最多占帧间隔的该比例，其余时间留给界面事件
+FRAME_BUDGET = 0.5
+
+
+class DisplayScheduler(QObject):
+    """与采样解耦的显示调度器。
+
+    采样回调只需调用 mark_dirty(widget) 标记需要重绘，调度器按固定帧率
+    统一刷新：两帧之间到达的所有样本合并为一次绘制，且只重绘可见的控件。
+    被调度的控件需要实现 render_frame() 方法。
+
+    到期时不可见（所在标签页未显示、被滚动到视口之外）的控件会被挂起：
+    不再占用定时器，后续的 mark_dirty 也不会唤醒定时器，直到控件收到
+    Show 或 Paint 事件（重新显示或露出）时才补绘一次。没有需要绘制的
+    控件时定时器停止，空闲时不消耗 CPU。
+
+    每帧的绘制耗时记入 frame_time_ms（滑动平均）。绘制超出帧预算时自动
+    降低帧率（不低于 MIN_FPS），耗时下降后逐步恢复到 set_fps 设定的帧率。
+    """
+
+    def __init__(self, fps=DEFAULT_FPS):
+        super().__init__()
+        self.target_fps = fps
+        self.fps = fps
+        self.frame_time_ms = 0.0
+        self.dirty = set()
+        self.hidden = set()  # 有未绘制的数据但当前不可见的控件
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.render_frame)
+
+    def set_fps(self, fps):
+        self.target_fps = max(1, fps)
+        self.apply_fps(self.target_fps)
+
+    def apply_fps(self, fps):
+        if fps != self.fps:
+            self.fps = fps
+            if self.timer.isActive():
+                self.timer.setInterval(self.frame_interval())
+
+    def adapt_fps(self):
+        """按绘制耗时选取不超过帧预算的帧率"""
+        if self.frame_time_ms > 0:
+            affordable = int(FRAME_BUDGET * 1000 / self.frame_time_ms)
+        else:
+            affordable = self.target_fps
+        self.apply_fps(max(min(self.target_fps, MIN_FPS), min(self.target_fps, affordable)))
+
+    def frame_interval(self):
+        return max(1, round(1000 / self.fps))
+
+    def mark_dirty(self, widget):
+        if widget in self.hidden:
+            return  # 已挂起，重新可见时会一并绘制
+        self.dirty.add(widget)
+        if not self.timer.isActive():
+            self.timer.start(self.frame_interval())
+
+    def render_frame(self):
+        start = time.perf_counter()
+        pending = self.dirty
+        self.dirty = set()
+        for widget in pending:
+            if widget.isVisible() and not widget.visibleRegion().isEmpty():
+                widget.render_frame()
+            else:
+                self.suspend(widget)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.frame_time_ms = 0.9 * self.frame_time_ms + 0.1 * elapsed_ms
+        self.adapt_fps()
+        if not self.dirty:
+            self.timer.stop()
+
+    def suspend(self, widget):
+        self.hidden.add(widget)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched in self.hidden and event.type() in (QEvent.Show, QEvent.Paint):
+            self.hidden.discard(watched)
+            watched.removeEventFilter(self)
+            self.mark_dirty(watched)
+        return False
+
+
+display_scheduler = None
+
+
+def get_display_scheduler():
+    """全局共享的显示调度器"""
+    global display_scheduler
+    if display_scheduler is None:
+        display_scheduler = DisplayScheduler()
+    return display_scheduler
@@ -0,0 +1,60 @@
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from common.StripChart import StripBuffer
+
+
+class MplStripChart(FigureCanvas):
+    """matplotlib 实现的滚动曲线图，接口与 StripChart 相同。
+
+    每次 refresh() 都经 Agg 重新栅格化整幅图，开销较大，但保留了完整的
+    坐标轴刻度、标题和网格；横轴为相对最新样本的时间。
+    """
+
+    def __init__(self, parent=None, window=10.0, ylim=(-1.0, 1.0), history=None, title=None,
+                 xlabel=None, ylabel=None, color='blue', label=None):
+        self.figure = Figure(figsize=(5, 3))
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.data = StripBuffer(window, history)
+        self.ax = self.figure.add_subplot(111)
+        if title:
+            self.ax.set_title(title)
+        if xlabel:
+            self.ax.set_xlabel(xlabel)
+        if ylabel:
+            self.ax.set_ylabel(ylabel)
+        self.ax.set_ylim(*ylim)
+        self.ax.set_xlim(-self.data.window, 0)
+        self.ax.grid(True)
+        self.line, = self.ax.plot([], [], color=color, label=label)
+        if label:
+            self.ax.legend(loc='upper right')
+
+    @property
+    def window(self):
+        return self.data.window
+
+    def append(self, times, values):
+        self.data.append(times, values)
+
+    def set_data(self, times, values):
+        self.data.clear()
+        self.data.append(times, values)
+        self.refresh()
+
+    def clear(self):
+        self.data.clear()
+        self.refresh()
+
+    def set_window(self, seconds):
+        self.data.window = float(seconds)
+        self.ax.set_xlim(-self.data.window, 0)
+
+    def set_ylim(self, lower, upper):
+        self.ax.set_ylim(lower, upper)
+
+    def refresh(self):
+        times, values = self.data.visible()
+        self.line.set_data(times - self.data.latest(), values)
+        self.draw()
@@ -0,0 +1,278 @@
+import os
+
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QRect
+from PyQt5.QtGui import QColor, QPainter, QPen, QPixmap, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+# 可选的绘图后端，'qpainter' 为本模块的 StripChart，'matplotlib' 为 MplStripChart
+PLOT_BACKENDS = ('matplotlib', 'qpainter')
+DEFAULT_PLOT_BACKEND = os.environ.get('PLOT_BACKEND', 'matplotlib')
+
+
+def create_strip_chart(backend=None, parent=None, **options):
+    """按后端名创建滚动曲线图，两种实现的接口相同：
+    append / set_data / clear / set_window / set_ylim / refresh
+    """
+    backend = backend or DEFAULT_PLOT_BACKEND
+    if backend == 'qpainter':
+        return StripChart(parent, **options)
+    if backend == 'matplotlib':
+        from common.MplStripChart import MplStripChart
+        return MplStripChart(parent, **options)
+    raise ValueError(f"Unknown plot backend: {backend}")
+
+
+class StripBuffer:
+    """滚动曲线图的数据：只保留最近 history 秒的样本，追加为均摊 O(1)"""
+
+    def __init__(self, window, history=None):
+        self.window = float(window)
+        self.history = history
+        self.times = np.empty(1024, dtype=np.float64)
+        self.values = np.empty(1024, dtype=np.float64)
+        self.size = 0
+
+    def retained_seconds(self):
+        return max(self.window, self.history or 0.0)
+
+    def latest(self):
+        return self.times[self.size - 1] if self.size > 0 else 0.0
+
+    def clear(self):
+        self.size = 0
+
+    def append(self, times, values):
+        """追加样本，返回因超出保留时长被丢弃的旧样本数"""
+        times = np.asarray(times, dtype=np.float64).ravel()
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = len(times)
+        dropped = 0
+        if n == 0:
+            return dropped
+        if self.size + n > len(self.times):
+            dropped = self.compact(times[-1])
+            # 压缩后仍超过一半容量时扩容，保证压缩次数为均摊 O(1)
+            if 2 * (self.size + n) > len(self.times):
+                capacity = 2 * (self.size + n)
+                self.times = np.concatenate((self.times[:self.size], np.empty(capacity - self.size)))
+                self.values = np.concatenate((self.values[:self.size], np.empty(capacity - self.size)))
+        self.times[self.size:self.size + n] = times
+        self.values[self.size:self.size + n] = values
+        self.size += n
+        return dropped
+
+    def compact(self, latest):
+        # 保留时长之前的样本多留一个，保证曲线从左边缘连续画起
+        start = int(np.searchsorted(self.times[:self.size], latest - self.retained_seconds())) - 1
+        if start <= 0:
+            return 0
+        kept = self.size - start
+        self.times[:kept] = self.times[start:self.size]
+        self.values[:kept] = self.values[start:self.size]
+        self.size = kept
+        return start
+
+    def visible(self):
+        """当前窗口内的 (时间戳, 数据)，同样向前多取一个样本"""
+        times = self.times[:self.size]
+        start = max(int(np.searchsorted(times, self.latest() - self.window)) - 1, 0)
+        return times[start:], self.values[start:self.size]
+
+
+class StripChart(QWidget):
+    """基于 QPainter 的滚动曲线图（示波器式的条带图）。
+
+    曲线先画在与绘图区同尺寸的 QPixmap 上。新样本到达时把 pixmap 向左滚动
+    对应的整像素数，只补画新到的线段；窗口长度、纵轴范围、控件尺寸改变或
+    整体替换数据时才全部重画，且每个像素列只画最小/最大值。每帧交给 Qt 的
+    只是一次 pixmap 拷贝，开销与采样率和窗口内样本数基本无关。
+    横轴为相对最新样本的时间，0 在右边缘。给出 label 时在绘图区右上角
+    画图例（不画在 pixmap 上，不随曲线滚动）。
+    """
+    MARGIN_LEFT = 50
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 10
+    MARGIN_BOTTOM = 22
+    TITLE_HEIGHT = 18
+    GRID_LINES = 4
+    LEGEND_LINE = 20
+
+    def __init__(self, parent=None, window=10.0, ylim=(-1.0, 1.0), history=None, title=None,
+                 xlabel=None, ylabel=None, color='blue', label=None):
+        super().__init__(parent)
+        self.data = StripBuffer(window, history)
+        self.ylim = (float(ylim[0]), float(ylim[1]))
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.label = label
+        self.pen = QPen(QColor(color))
+        self.grid_pen = QPen(QColor(220, 220, 220))
+        self.pixmap = None
+        self.pixmap_origin = 0.0  # pixmap 右边缘对应的时间
+        self.drawn = 0  # 已画到 pixmap 上的样本数
+        self.full_redraw = True
+        self.setMinimumSize(200, 120)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    @property
+    def window(self):
+        return self.data.window
+
+    def append(self, times, values):
+        dropped = self.data.append(times, values)
+        self.drawn = max(self.drawn - dropped, 0)
+
+    def set_data(self, times, values):
+        self.data.clear()
+        self.data.append(times, values)
+        self.invalidate()
+
+    def clear(self):
+        self.data.clear()
+        self.invalidate()
+
+    def set_window(self, seconds):
+        if float(seconds) != self.data.window:
+            self.data.window = float(seconds)
+            self.invalidate()
+
+    def set_ylim(self, lower, upper):
+        if (float(lower), float(upper)) != self.ylim:
+            self.ylim = (float(lower), float(upper))
+            self.invalidate()
+
+    def invalidate(self):
+        self.full_redraw = True
+        self.update()
+
+    def refresh(self):
+        """把新追加的样本画出来（在下一次绘制事件中完成）"""
+        self.update()
+
+    def plot_rect(self):
+        top = self.MARGIN_TOP + (self.TITLE_HEIGHT if self.title else 0)
+        bottom = self.MARGIN_BOTTOM + (self.TITLE_HEIGHT if self.xlabel else 0)
+        left = self.MARGIN_LEFT + (self.TITLE_HEIGHT if self.ylabel else 0)
+        return QRect(left, top, max(self.width() - left - self.MARGIN_RIGHT, 1),
+                     max(self.height() - top - bottom, 1))
+
+    def map_points(self, times, values, width, height):
+        x = width - (self.pixmap_origin - times) * (width / self.data.window)
+        y = height - (values - self.ylim[0]) * (height / (self.ylim[1] - self.ylim[0]))
+        return x, y
+
+    def draw_polyline(self, painter, x, y):
+        if len(x) == 0:
+            return
+        painter.setPen(self.pen)
+        painter.drawPolyline(QPolygonF([QPointF(px, py) for px, py in zip(x.tolist(), y.tolist())]))
+
+    def draw_background(self, painter, x, width):
+        # 水平网格线不随滚动变化，可以只补画新露出的区域
+        height = self.pixmap.height()
+        painter.fillRect(x, 0, width, height, Qt.white)
+        painter.setPen(self.grid_pen)
+        for i in range(1, self.GRID_LINES):
+            y = round(height * i / self.GRID_LINES)
+            painter.drawLine(x, y, x + width, y)
+
+    def redraw_pixmap(self, rect):
+        self.pixmap = QPixmap(rect.size())
+        width, height = rect.width(), rect.height()
+        painter = QPainter(self.pixmap)
+        self.draw_background(painter, 0, width)
+        self.pixmap_origin = self.data.latest()
+        times, values = self.data.visible()
+        x, y = self.map_points(times, values, width, height)
+        if len(x) > 4 * width:
+            # 每个像素列只保留最小/最大值
+            columns = x.astype(np.int64)
+            starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+            low = np.minimum.reduceat(y, starts)
+            high = np.maximum.reduceat(y, starts)
+            x = np.repeat(columns[starts], 2).astype(np.float64)
+            y = np.column_stack((low, high)).ravel()
+        self.draw_polyline(painter, x, y)
+        painter.end()
+        self.drawn = self.data.size
+        self.full_redraw = False
+
+    def draw_new_segments(self, rect):
+        if self.drawn >= self.data.size:
+            return
+        width, height = rect.width(), rect.height()
+        pixels_per_second = width / self.data.window
+        shift = int((self.data.latest() - self.pixmap_origin) * pixels_per_second)
+        if shift >= width:
+            self.redraw_pixmap(rect)
+            return
+        painter = QPainter(self.pixmap)
+        if shift > 0:
+            self.pixmap.scroll(-shift, 0, self.pixmap.rect())
+            self.pixmap_origin += shift / pixels_per_second
+            self.draw_background(painter, width - shift, shift)
+        # 从上一次画到的最后一个样本开始，保证线段连续
+        start = max(self.drawn - 1, 0)
+        x, y = self.map_points(self.data.times[start:self.data.size], self.data.values[start:self.data.size],
+                               width, height)
+        self.draw_polyline(painter, x, y)
+        painter.end()
+        self.drawn = self.data.size
+
+    def draw_legend(self, painter, rect):
+        metrics = painter.fontMetrics()
+        padding = 4
+        width = self.LEGEND_LINE + 3 * padding + metrics.horizontalAdvance(self.label)
+        height = metrics.height() + 2 * padding
+        box = QRect(rect.right() - width - padding, rect.top() + padding, width, height)
+        painter.fillRect(box, Qt.white)
+        painter.setPen(self.grid_pen)
+        painter.drawRect(box)
+        y = box.center().y()
+        painter.setPen(self.pen)
+        painter.drawLine(box.left() + padding, y, box.left() + padding + self.LEGEND_LINE, y)
+        painter.setPen(Qt.black)
+        painter.drawText(QRect(box.left() + 2 * padding + self.LEGEND_LINE, box.top(), width, height),
+                         Qt.AlignLeft | Qt.AlignVCenter, self.label)
+
+    def paintEvent(self, event):
+        rect = self.plot_rect()
+        if self.pixmap is None or self.pixmap.size() != rect.size() or self.full_redraw:
+            self.redraw_pixmap(rect)
+        else:
+            self.draw_new_segments(rect)
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+        painter.drawPixmap(rect.topLeft(), self.pixmap)
+        if self.label:
+            self.draw_legend(painter, rect)
+        painter.setPen(Qt.black)
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        metrics = painter.fontMetrics()
+        text_height = metrics.height()
+        for i in range(self.GRID_LINES + 1):
+            value = self.ylim[1] - (self.ylim[1] - self.ylim[0]) * i / self.GRID_LINES
+            y = rect.top() + round(rect.height() * i / self.GRID_LINES)
+            painter.drawText(QRect(rect.left() - self.MARGIN_LEFT, y - text_height // 2, self.MARGIN_LEFT - 4,
+                                   text_height), Qt.AlignRight | Qt.AlignVCenter, f'{value:g}')
+        label_top = rect.bottom() + 4
+        painter.drawText(QRect(rect.left(), label_top, rect.width(), text_height), Qt.AlignLeft,
+                         f'{-self.data.window:g}')
+        painter.drawText(QRect(rect.left(), label_top, rect.width(), text_height), Qt.AlignRight, '0')
+        if self.xlabel:
+            painter.drawText(QRect(rect.left(), label_top + text_height, rect.width(), text_height),
+                             Qt.AlignHCenter, self.xlabel)
+        if self.title:
+            painter.drawText(QRect(rect.left(), self.MARGIN_TOP // 2, rect.width(), self.TITLE_HEIGHT),
+                             Qt.AlignHCenter | Qt.AlignVCenter, self.title)
+        if self.ylabel:
+            painter.save()
+            painter.translate(self.MARGIN_RIGHT, rect.center().y())
+            painter.rotate(-90)
+            painter.drawText(QRect(-rect.height() // 2, -text_height // 2, rect.height(), text_height),
+                             Qt.AlignHCenter | Qt.AlignVCenter, self.ylabel)
+            painter.restore()
+        painter.end()
@@ -1,7 +1,11 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout ,QScrollArea
-from PyQt5.QtCore import QThread, pyqtSignal
-from xiangmu_1.SensorPlot import SensorPlot
+import time
+
+STARTUP_TIME = time.perf_counter()  # 启动计时从导入各模块之前开始
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout ,QScrollArea, QLabel
+from PyQt5.QtCore import QThread, QTimer, Qt, pyqtSignal
+from xiangmu_1.SensorPlot import SensorPlot, RecordingControl, BatchFilterControl, shutdown_acquisition_engine
 from xiangmu_2.SignalGenerator import SignalUI
 from xiangmu_3.DI_DO import DI_Tab , DO_Tab
 
@@ -33,6 +37,32 @@ class SignalGeneratorTab(QWidget):
         self.signal_ui = SignalUI(self)  # 假设SignalUI的构造函数接受一个QWidget作为父窗口
         self.layout.addWidget(self.signal_ui)
 
+class LazyTab(QWidget):
+    """标签页占位控件：首次切换到该页时才调用 factory 构造真正的内容"""
+
+    def __init__(self, factory, parent=None):
+        super(LazyTab, self).__init__(parent)
+        self.factory = factory
+        self.widget = None
+        self.build_time = None
+        self.layout = QVBoxLayout(self)
+        self.placeholder = QLabel("Loading...", self)
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.placeholder)
+
+    def ensure_built(self):
+        if self.widget is None:
+            start = time.perf_counter()
+            self.widget = self.factory()
+            self.layout.removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.layout.addWidget(self.widget)
+            self.build_time = time.perf_counter() - start
+        return self.widget
+
+    def is_built(self):
+        return self.widget is not None
+
 class MainApplication(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -43,27 +73,49 @@ class MainApplication(QMainWindow):
         self.tab_widget = QTabWidget()
         self.setCentralWidget(self.tab_widget)
 
-        # 创建4个标签页
-        self.do_tab = DO_Tab()
-        self.di_tab = DI_Tab()
-        self.ai_tab = self.create_sensor_tab()
-        self.ao_tab = SignalUI()
+        # 创建4个标签页：先放占位控件，首次切换到该页时才构造（DI/DO 线程也随之启动）
+        self.sensor_plots = []
+        self.ai_tab = LazyTab(self.create_sensor_tab)
+        self.ao_tab = LazyTab(SignalUI)
+        self.di_lazy_tab = LazyTab(DI_Tab)
+        self.do_lazy_tab = LazyTab(DO_Tab)
 
         self.create_tab("Sensor Plot", self.ai_tab)
         self.create_tab("Signal Generator", self.ao_tab)
-        self.create_tab("DI", self.di_tab)
-        self.create_tab("DO", self.do_tab)
+        self.create_tab("DI", self.di_lazy_tab)
+        self.create_tab("DO", self.do_lazy_tab)
+        self.lazy_tabs = [self.ai_tab, self.ao_tab, self.di_lazy_tab, self.do_lazy_tab]
 
         self.tab_widget.currentChanged.connect(self.on_tab_change)
+        # 窗口显示之后再构造当前标签页
+        QTimer.singleShot(0, self.on_startup)
+
+    @property
+    def di_tab(self):
+        return self.di_lazy_tab.widget
+
+    @property
+    def do_tab(self):
+        return self.do_lazy_tab.widget
+
+    def on_startup(self):
+        shown = time.perf_counter() - STARTUP_TIME
+        self.on_tab_change(self.tab_widget.currentIndex())
+        message = (f"Window shown in {shown * 1000:.0f} ms, "
+                   f"first tab built in {self.lazy_tabs[self.tab_widget.currentIndex()].build_time * 1000:.0f} ms")
+        self.statusBar().showMessage(message, 10000)
 
     def create_sensor_tab(self):
         # 创建一个 QWidget 作为 Sensor Plot 的容器
         tab1 = QWidget()
         tab1_layout = QVBoxLayout(tab1)
+        tab1_layout.addWidget(RecordingControl(tab1))
+        tab1_layout.addWidget(BatchFilterControl(self.sensor_plots, tab1))
 
         # 在 Sensor Plot 标签页中添加8个 SensorPlot 实例
         for i in range(8):
             sensor_plot = SensorPlot(tab1, i)  # 假设 parent 是 tab1，index 是循环变量 i
+            self.sensor_plots.append(sensor_plot)
             tab1_layout.addWidget(sensor_plot)
 
         return tab1
@@ -77,14 +129,23 @@ class MainApplication(QMainWindow):
         # 将 QScrollArea 添加到 QTabWidget 的标签页中
         self.tab_widget.addTab(scroll_area, title)
 
+    def closeEvent(self, event):
+        # 采集线程在窗口销毁前退出并释放设备，已加载的数据文件同时关闭
+        shutdown_acquisition_engine()
+        for sensor_plot in self.sensor_plots:
+            sensor_plot.release_recording()
+        super().closeEvent(event)
+
     def on_update_signal(self, data):
         # 处理来自工作线程的信号
         pass
 
     def on_tab_change(self, index):
+        self.lazy_tabs[index].ensure_built()
 
         if index in [0, 1, 3]:  # DO Tab
-            self.di_tab.stop_thread()
+            if self.di_tab is not None:
+                self.di_tab.stop_thread()
         elif index == 2:  # DI Tab
             self.di_tab.resume_thread()
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 与各模块中的 sys.path.append 相同：以项目根目录为导入起点
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
@@ -0,0 +1,72 @@
+import numpy as np
+
+from xiangmu_1.ChannelPipeline import ChannelPipeline, decimate_stage, scale_stage
+
+
+class CountingStage:
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+def make_pipeline(values):
+    source = CountingStage(lambda: (np.arange(len(values), dtype=np.float64), values))
+    scale = CountingStage(scale_stage)
+    decimation = CountingStage(decimate_stage)
+    pipeline = ChannelPipeline(source)
+    pipeline.add_stage('scale', scale, factor=1)
+    pipeline.add_stage('decimate', decimation, n_columns=0)
+    return pipeline, source, scale, decimation
+
+
+def test_outputs_are_computed_lazily_and_cached():
+    values = np.sin(np.arange(100.0))
+    pipeline, source, scale, decimation = make_pipeline(values)
+    assert source.calls == 0
+    times, result = pipeline.output()
+    np.testing.assert_array_equal(result, values)
+    pipeline.output()
+    pipeline.output('scale')
+    assert (source.calls, scale.calls, decimation.calls) == (1, 1, 1)
+
+
+def test_param_change_recomputes_only_downstream_stages():
+    values = np.sin(np.arange(100.0))
+    pipeline, source, scale, decimation = make_pipeline(values)
+    pipeline.output()
+    pipeline.set_params('scale', factor=3)
+    _, result = pipeline.output()
+    np.testing.assert_array_equal(result, 3 * values)
+    assert (source.calls, scale.calls, decimation.calls) == (1, 2, 2)
+    # 取值未变化时不失效
+    pipeline.set_params('scale', factor=3)
+    pipeline.output()
+    assert scale.calls == 2
+    pipeline.set_params('decimate', n_columns=10)
+    _, result = pipeline.output()
+    assert len(result) <= 2 * 10 + 10
+    assert (source.calls, scale.calls, decimation.calls) == (1, 2, 3)
+
+
+def test_stages_do_not_modify_the_source():
+    values = np.ones(50)
+    pipeline, *_ = make_pipeline(values)
+    pipeline.set_params('scale', factor=5)
+    pipeline.output()
+    np.testing.assert_array_equal(values, np.ones(50))
+    pipeline.invalidate()
+    np.testing.assert_array_equal(pipeline.output('source')[1], np.ones(50))
+
+
+def test_key_reflects_upstream_params_only():
+    pipeline, *_ = make_pipeline(np.zeros(10))
+    scale_key = pipeline.key('scale')
+    pipeline.set_params('decimate', n_columns=5)
+    assert pipeline.key('scale') == scale_key
+    pipeline.set_params('scale', factor=2)
+    assert pipeline.key('scale') != scale_key
+    assert pipeline.get_param('scale', 'factor') == 2
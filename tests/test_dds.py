@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from xiangmu_2 import DDS
+from xiangmu_2.DDS import DDSEngine
+
+
+@pytest.mark.parametrize('period', [2, 3, 7, 8, 99, 100])
+def test_square_matches_baseline_split_without_exact_table(monkeypatch, period):
+    # 强制走相位累加路径
+    monkeypatch.setattr(DDS, 'MAX_TABLE_PERIOD', 0)
+    engine = DDSEngine('square', offset=0.0, amplitude=1.0, period=period)
+    assert engine.exact_table is None
+    values = engine.next_chunk(3 * period)
+    expected = np.where(np.arange(period) < period // 2, 1.0, -1.0)
+    np.testing.assert_array_equal(values, np.tile(expected, 3))
+
+
+def test_square_exact_table_matches_baseline_split():
+    engine = DDSEngine('square', offset=1.0, amplitude=1.0, period=7)
+    np.testing.assert_array_equal(engine.next_chunk(7), [2, 2, 2, 0, 0, 0, 0])
+
+
+@pytest.mark.parametrize('total_cycles', [1, 1.5, 2, 2.5])
+def test_cycle_limit_sample_count_for_integer_periods(total_cycles):
+    for period in range(1, 401):
+        engine = DDSEngine('sine', offset=0.0, amplitude=1.0, period=period)
+        # 与逐点公式一致：周期内位置 cycles + i / period 小于 total_cycles 的样本都输出
+        expected = math.ceil(total_cycles * period)
+        assert engine.samples_until(total_cycles) == expected, period
+        # 逐点取样本（逐点输出线程的方式）也在同一位置停止
+        written = 0
+        while engine.samples_until(total_cycles) > 0:
+            written += len(engine.next_chunk(1))
+        assert written == expected, period
+
+
+@pytest.mark.parametrize('period, total_cycles, expected', [(3, 1.5, 5), (100, 0.005, 1), (100, 0.015, 2)])
+@pytest.mark.parametrize('exact_table', [True, False])
+def test_cycle_limit_rounds_partial_samples_up(monkeypatch, period, total_cycles, expected, exact_table):
+    if not exact_table:
+        monkeypatch.setattr(DDS, 'MAX_TABLE_PERIOD', 0)
+    engine = DDSEngine('sine', offset=0.0, amplitude=1.0, period=period)
+    assert (engine.exact_table is not None) == exact_table
+    assert engine.samples_until(total_cycles) == expected
+
+
+def test_cycle_limit_after_partial_chunks():
+    engine = DDSEngine('ramp', offset=0.0, amplitude=1.0, period=200)
+    engine.next_chunk(150)
+    assert engine.samples_until(1) == 50
+    engine.next_chunk(50)
+    assert engine.cycles == 1
+    assert engine.samples_until(1) == 0
+    assert engine.samples_until(3) == 400
@@ -0,0 +1,31 @@
+import threading
+import time
+
+from common.DeadlineTimer import DeadlineTimer
+
+
+def test_deadlines_do_not_drift():
+    timer = DeadlineTimer(200)
+    deadlines = [timer.wait() for _ in range(20)]
+    steps = [b - a for a, b in zip(deadlines, deadlines[1:])]
+    # 截止时间按 start + k * period 计算，与每次唤醒的延迟无关（错过时跳过整周期）
+    assert all(step >= 5_000_000 and min(step % 5_000_000, -step % 5_000_000) <= 1 for step in steps)
+    assert time.perf_counter_ns() >= deadlines[-1]
+
+
+def test_missed_periods_are_skipped():
+    timer = DeadlineTimer(1000)
+    timer.wait()
+    time.sleep(0.0105)
+    timer.wait()
+    assert timer.missed >= 9
+
+
+def test_interrupt_wakes_a_long_wait():
+    timer = DeadlineTimer(0.5)
+    threading.Timer(0.05, timer.interrupt).start()
+    start = time.perf_counter()
+    timer.wait()
+    assert time.perf_counter() - start < 1.0
+    timer.reset()
+    assert not timer.interrupted.is_set()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from xiangmu_1.Decimation import decimate, lttb, minmax_decimate
+
+
+def test_minmax_keeps_every_bucket_extreme_and_the_tail():
+    rng = np.random.default_rng(1)
+    n, columns = 10_007, 100
+    x = np.arange(n, dtype=np.float64)
+    y = rng.standard_normal(n)
+    y[1234] = 50.0  # 毛刺
+    y[8765] = -50.0
+    dx, dy = minmax_decimate(x, y, columns)
+    assert len(dx) <= 2 * columns + n // columns
+    assert np.all(np.diff(dx) >= 0)  # 保持时间顺序
+    assert dy.max() == 50.0 and dy.min() == -50.0
+    assert dx[-1] == x[-1]  # 最新样本一定保留
+    bucket = n // columns
+    for k in range(columns):
+        block = y[k * bucket:(k + 1) * bucket]
+        in_bucket = dy[(dx >= k * bucket) & (dx < (k + 1) * bucket)]
+        assert in_bucket.min() == block.min() and in_bucket.max() == block.max()
+
+
+def test_short_data_is_not_decimated():
+    x = np.arange(10.0)
+    y = np.sin(x)
+    for method in ('minmax', 'lttb'):
+        dx, dy = decimate(x, y, 100, method)
+        np.testing.assert_array_equal(dx, x)
+        np.testing.assert_array_equal(dy, y)
+
+
+@pytest.mark.parametrize('n_out', [3, 10, 257])
+def test_lttb_output_size_and_endpoints(n_out):
+    x = np.linspace(0, 10, 5000)
+    y = np.sin(3 * x)
+    dx, dy = lttb(x, y, n_out)
+    assert len(dx) == n_out
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert np.all(np.diff(dx) > 0)
+    # 所有输出点都是原始数据点
+    np.testing.assert_array_equal(dy, np.sin(3 * dx))
+
+
+def test_lttb_picks_the_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[500] = 10.0
+    _, dy = lttb(x, y, 20)
+    assert 10.0 in dy
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pytest
+
+from xiangmu_1.Pyramid import MinMaxPyramid, pyramid_path
+
+
+def chunks(times, values, size):
+    for start in range(0, len(values), size):
+        yield times[start:start + size], values[start:start + size]
+
+
+def make_data(n=100_003, rate=1000.0):
+    rng = np.random.default_rng(2)
+    return np.arange(n) / rate, rng.standard_normal(n)
+
+
+@pytest.mark.parametrize('chunk_size', [1000, 4097, 1 << 20])
+def test_build_is_independent_of_chunking(chunk_size):
+    times, values = make_data()
+    reference = MinMaxPyramid.build(chunks(times, values, len(values)), base_block=64)
+    pyramid = MinMaxPyramid.build(chunks(times, values, chunk_size), base_block=64)
+    assert pyramid.blocks == reference.blocks
+    for k in range(len(pyramid.blocks)):
+        np.testing.assert_array_equal(pyramid.mins[k], reference.mins[k])
+        np.testing.assert_array_equal(pyramid.maxs[k], reference.maxs[k])
+
+
+def test_levels_bound_the_raw_data():
+    times, values = make_data()
+    pyramid = MinMaxPyramid.build(chunks(times, values, 10_000), base_block=64)
+    base = pyramid.blocks[0]
+    usable = (len(values) // base) * base
+    blocks = values[:usable].reshape(-1, base)
+    np.testing.assert_array_equal(pyramid.mins[0][:len(blocks)], blocks.min(axis=1))
+    np.testing.assert_array_equal(pyramid.maxs[0][:len(blocks)], blocks.max(axis=1))
+    for k in range(len(pyramid.blocks)):
+        # 每一层的整体极值都等于原始数据的极值
+        assert pyramid.mins[k].min() == values.min()
+        assert pyramid.maxs[k].max() == values.max()
+    assert len(pyramid.mins[-1]) == 1
+
+
+def test_envelope_covers_the_window_at_a_coarse_level():
+    times, values = make_data()
+    pyramid = MinMaxPyramid.build(chunks(times, values, 10_000), base_block=64)
+    t, y = pyramid.envelope(10.0, 90.0, 500, 1000.0)
+    # 所选层的块大小在每像素样本数的一半以内，每块两个点
+    assert len(t) == len(y) <= 4 * 500 + 4
+    assert t[0] <= 10.0 and t[-1] <= 90.0
+    window = values[(times >= t[0]) & (times < 90.0)]
+    assert y.min() <= window.min() and y.max() >= window.max()
+    # 窗口过短、每像素样本数小于最细一层时没有可用的层
+    assert pyramid.envelope(10.0, 10.1, 500, 1000.0) is None
+
+
+def test_save_and_load_round_trip_and_invalidation(tmp_path):
+    times, values = make_data(10_000)
+    source = tmp_path / 'data.bin'
+    values.astype('<f8').tofile(source)
+    pyramid = MinMaxPyramid.build(chunks(times, values, 4096), base_block=64)
+    path = pyramid_path(str(source), 0)
+    pyramid.save(path, str(source))
+    loaded = MinMaxPyramid.load(path, str(source))
+    assert loaded.blocks == pyramid.blocks
+    for k in range(len(pyramid.blocks)):
+        np.testing.assert_array_equal(loaded.times[k], pyramid.times[k])
+        np.testing.assert_array_equal(loaded.maxs[k], pyramid.maxs[k])
+    # 源文件变化后缓存失效
+    with open(source, 'ab') as f:
+        f.write(b'\0' * 8)
+    assert MinMaxPyramid.load(path, str(source)) is None
+    assert MinMaxPyramid.load(path + '.missing', str(source)) is None
+    os.remove(path)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from common.ResultCache import ResultCache
+
+
+def array(n):
+    return np.zeros(n, dtype=np.float64)  # n * 8 字节
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache(max_bytes=3 * 800)
+    for key in 'abc':
+        cache.put(key, array(100))
+    assert cache.get('a') is not None  # a 变为最近使用
+    cache.put('d', array(100))
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.total_bytes == 3 * 800
+
+
+def test_oversized_result_is_not_cached():
+    cache = ResultCache(max_bytes=800)
+    cache.put('small', array(10))
+    cache.put('big', array(1000))
+    assert 'big' not in cache
+    assert 'small' in cache
+
+
+def test_replacing_a_key_updates_the_size():
+    cache = ResultCache(max_bytes=10_000)
+    cache.put('k', array(100))
+    cache.put('k', array(10))
+    assert len(cache) == 1
+    assert cache.total_bytes == 80
+
+
+def test_get_or_compute_computes_once_and_counts_hits():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return (array(4), array(4))
+
+    first = cache.get_or_compute(('fft', 1), compute)
+    second = cache.get_or_compute(('fft', 1), compute)
+    assert first is second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.total_bytes == 64
+    cache.clear()
+    assert len(cache) == 0 and cache.total_bytes == 0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from xiangmu_1.RingBuffer import RingBuffer
+
+
+def test_append_wraps_around_and_keeps_latest_samples():
+    buffer = RingBuffer(5, columns=2)
+    for i in range(12):
+        buffer.append(float(i), 10.0 * i, -10.0 * i)
+    assert len(buffer) == 5
+    np.testing.assert_array_equal(buffer.times(), [7, 8, 9, 10, 11])
+    np.testing.assert_array_equal(buffer.values(0), [70, 80, 90, 100, 110])
+    np.testing.assert_array_equal(buffer.values(1), [-70, -80, -90, -100, -110])
+
+
+@pytest.mark.parametrize('block', [1, 3, 5, 7, 13])
+def test_extend_across_the_wrap_point_matches_tail_of_input(block):
+    capacity = 5
+    buffer = RingBuffer(capacity, columns=1)
+    timestamps = np.arange(40, dtype=np.float64)
+    for start in range(0, len(timestamps), block):
+        chunk = timestamps[start:start + block]
+        buffer.extend(chunk, 2.0 * chunk)
+        expected = timestamps[max(start + len(chunk) - capacity, 0):start + len(chunk)]
+        np.testing.assert_array_equal(buffer.times(), expected)
+        np.testing.assert_array_equal(buffer.values(), 2.0 * expected)
+
+
+def test_views_are_contiguous_after_wraparound():
+    buffer = RingBuffer(4)
+    buffer.extend(np.arange(6.0), np.arange(6.0))
+    assert buffer.times().flags['C_CONTIGUOUS']
+    times, values = buffer.last_seconds(1.5)
+    np.testing.assert_array_equal(times, [4, 5])
+    np.testing.assert_array_equal(values, [4, 5])
+
+
+def test_write_column_updates_both_mirrors_across_wrap():
+    buffer = RingBuffer(4, columns=2)
+    buffer.extend(np.arange(6.0), np.column_stack((np.arange(6.0), np.zeros(6))))
+    buffer.write_column(1, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(buffer.values(1), [0, 1, 2, 3])
+    np.testing.assert_array_equal(buffer.values(0), [2, 3, 4, 5])
+    # 再追加一个样本后，覆盖的值仍按时间顺序保留
+    buffer.append(6.0, 6.0, 4.0)
+    np.testing.assert_array_equal(buffer.values(1), [1, 2, 3, 4])
+
+
+def test_ensure_capacity_keeps_wrapped_data_in_order():
+    buffer = RingBuffer(3)
+    buffer.extend(np.arange(5.0), np.arange(5.0))
+    buffer.ensure_capacity(6)
+    np.testing.assert_array_equal(buffer.times(), [2, 3, 4])
+    buffer.extend([5.0, 6.0], [5.0, 6.0])
+    np.testing.assert_array_equal(buffer.values(), [2, 3, 4, 5, 6])
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from xiangmu_1.Spectrum import WELCH_THRESHOLD, batch_fft_filter, fft_filter, spectrum
+
+
+@pytest.mark.parametrize('n', [WELCH_THRESHOLD // 2, WELCH_THRESHOLD, WELCH_THRESHOLD * 2])
+def test_spectrum_amplitude_continuous_across_welch_threshold(n):
+    sampling_rate = 1024
+    t = np.arange(n) / sampling_rate
+    data = 0.5 + 3.0 * np.sin(2 * np.pi * 64 * t)
+    freq, amplitude = spectrum(data, sampling_rate)
+    peak = np.argmax(amplitude[1:]) + 1
+    assert freq[peak] == pytest.approx(64)
+    assert amplitude[peak] == pytest.approx(3.0, rel=1e-6)
+    assert amplitude[0] == pytest.approx(0.5, rel=1e-6)
+
+
+def test_batch_filter_matches_per_channel_filter():
+    rng = np.random.default_rng(0)
+    # 长度或采样率不同的通道分在不同的组中
+    channels = [rng.standard_normal(1000), rng.standard_normal(1000), rng.standard_normal(600),
+                rng.standard_normal(1000)]
+    rates = [500, 500, 500, 250]
+    results = batch_fft_filter(channels, 10, 60, rates)
+    assert len(results) == len(channels)
+    for channel, rate, result in zip(channels, rates, results):
+        np.testing.assert_allclose(result, fft_filter(channel, 10, 60, rate), atol=1e-12)
+
+
+def test_fft_filter_keeps_only_the_pass_band():
+    sampling_rate = 1000
+    t = np.arange(1000) / sampling_rate
+    data = np.sin(2 * np.pi * 20 * t) + np.sin(2 * np.pi * 200 * t)
+    np.testing.assert_allclose(fft_filter(data, 0, 100, sampling_rate), np.sin(2 * np.pi * 20 * t), atol=1e-9)
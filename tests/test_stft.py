@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from xiangmu_1.Spectrum import StreamingSTFT, stft_segment_length, window_array
+
+
+def one_shot_columns(data, segment_length, hop):
+    frames = np.lib.stride_tricks.sliding_window_view(data, segment_length)[::hop]
+    magnitude = np.abs(np.fft.rfft(frames * window_array('hann', segment_length), axis=1))
+    return 20 * np.log10(magnitude + 1e-12)
+
+
+@pytest.mark.parametrize('block', [1, 13, 64, 1000])
+def test_incremental_stft_equals_one_shot(block):
+    rng = np.random.default_rng(4)
+    data = rng.standard_normal(3000)
+    stft = StreamingSTFT(sampling_rate=256, history_seconds=100, segment_length=128)
+    frames = 0
+    for start in range(0, len(data), block):
+        frames += stft.push(data[start:start + block])
+    expected = one_shot_columns(data, 128, 64)
+    assert frames == len(expected)
+    image = stft.image()
+    assert image.shape == (65, stft.history)
+    np.testing.assert_allclose(image[:, -frames:], expected.T, rtol=1e-12, atol=1e-9)
+    # 尚未有数据的列保持为下限
+    assert np.all(image[:, :-frames] == StreamingSTFT.FLOOR_DB)
+
+
+def test_history_keeps_only_the_latest_columns():
+    rng = np.random.default_rng(5)
+    data = rng.standard_normal(5000)
+    stft = StreamingSTFT(sampling_rate=64, history_seconds=10, segment_length=64)
+    assert stft.history == 20
+    stft.push(data[:2500])
+    stft.push(data[2500:])
+    expected = one_shot_columns(data, 64, 32)[-stft.history:]
+    image = stft.image()
+    assert np.shares_memory(image, stft.columns)  # 零拷贝视图
+    np.testing.assert_allclose(image, expected.T, rtol=1e-12, atol=1e-9)
+
+
+def test_sine_peak_lands_in_its_bin():
+    rate = 512
+    t = np.arange(4096) / rate
+    stft = StreamingSTFT(rate, history_seconds=4)
+    stft.push(np.sin(2 * np.pi * 64 * t))
+    latest = stft.image()[:, -1]
+    resolution = rate / stft.segment_length
+    assert np.argmax(latest) * resolution == pytest.approx(64)
+    assert stft.extent()[3] == rate / 2
+
+
+@pytest.mark.parametrize('rate, expected', [(1, 32), (100, 64), (1000, 512), (100_000, 1024)])
+def test_segment_length_is_clamped_power_of_two(rate, expected):
+    assert stft_segment_length(rate) == expected
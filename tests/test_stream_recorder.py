@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from xiangmu_1 import StreamRecorder as StreamRecorder_module
+from xiangmu_1.StreamRecorder import RECORDING_SUFFIX, RecordingReader, StreamRecorder
+
+CHANNELS = 3
+
+
+def record(path, batches, compress, chunk_frames=64):
+    recorder = StreamRecorder(str(path), CHANNELS, 500, compress=compress, chunk_frames=chunk_frames)
+    recorder.start()
+    for timestamps, frames in batches:
+        recorder.write(timestamps, frames)
+    recorder.stop()
+    return recorder
+
+
+def make_batches(total, batch):
+    timestamps = np.arange(total) / 500.0
+    frames = np.column_stack([np.sin(timestamps * (c + 1)) for c in range(CHANNELS)])
+    batches = [(timestamps[i:i + batch], frames[i:i + batch]) for i in range(0, total, batch)]
+    return timestamps, frames, batches
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_write_read_round_trip(tmp_path, compress):
+    # 总帧数不是块大小的整数倍：最后不满一块的数据在 stop() 时写出
+    timestamps, frames, batches = make_batches(1000, 7)
+    recorder = record(tmp_path / ('data' + RECORDING_SUFFIX), batches, compress)
+    assert recorder.error is None
+    assert recorder.frames_written == 1000
+    assert recorder.dropped_frames == 0
+
+    reader = RecordingReader(recorder.path)
+    assert reader.channels == CHANNELS
+    assert reader.sampling_rate == 500
+    assert reader.compressed == compress
+    assert len(reader) == 1000
+    assert reader.start_time == timestamps[0]
+    assert reader.end_time == timestamps[-1]
+    for channel in range(CHANNELS):
+        read_times, read_values = zip(*reader.iter_chunks(channel))
+        np.testing.assert_array_equal(np.concatenate(read_times), timestamps)
+        np.testing.assert_array_equal(np.concatenate(read_values), frames[:, channel])
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_window_reads_only_requested_range(tmp_path, compress):
+    timestamps, frames, batches = make_batches(1000, 50)
+    recorder = record(tmp_path / ('data' + RECORDING_SUFFIX), batches, compress)
+    channel = RecordingReader(recorder.path).channel(1)
+    times, values = channel.window(0.5, 1.2)
+    mask = (timestamps >= 0.5) & (timestamps <= 1.2)
+    np.testing.assert_array_equal(times, timestamps[mask])
+    np.testing.assert_array_equal(values, frames[mask, 1])
+
+
+def test_truncated_last_chunk_is_ignored(tmp_path):
+    timestamps, frames, batches = make_batches(256, 64)
+    path = tmp_path / ('data' + RECORDING_SUFFIX)
+    record(path, batches, compress=False)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    reader = RecordingReader(str(path))
+    assert len(reader) == 192
+    np.testing.assert_array_equal(next(reader.iter_chunks(0))[0], timestamps[:64])
+
+
+def test_rejects_other_files(tmp_path, monkeypatch):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a recording')
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        f = open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(StreamRecorder_module, 'open', tracking_open, raising=False)
+    with pytest.raises(ValueError):
+        RecordingReader(str(path))
+    # 出错时文件句柄也被关闭
+    assert opened and all(f.closed for f in opened)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_close_releases_file_and_mapping(tmp_path, compress):
+    _, _, batches = make_batches(200, 50)
+    path = tmp_path / ('data' + RECORDING_SUFFIX)
+    record(path, batches, compress)
+    with RecordingReader(str(path)) as reader:
+        reader.window(0, 1, 0.2)
+    assert reader.file.closed
+    assert reader.mm is None
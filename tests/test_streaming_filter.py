@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+
+from xiangmu_1.StreamingFilter import StreamingFilter
+
+
+def signal_blocks(data, sizes):
+    start = 0
+    while start < len(data):
+        for size in sizes:
+            yield data[start:start + size]
+            start += size
+
+
+@pytest.mark.parametrize('design', ['iir', 'fir'])
+@pytest.mark.parametrize('lower_bound', [0, 20])
+def test_blockwise_filtering_equals_one_shot(design, lower_bound):
+    rng = np.random.default_rng(3)
+    data = rng.standard_normal(5000) + 2.0
+    make = getattr(StreamingFilter, design)
+    one_shot = make(lower_bound, 100, 1000).process(data)
+
+    streaming = make(lower_bound, 100, 1000)
+    blocks = [streaming.process(block) for block in signal_blocks(data, [1, 7, 130, 0, 999])]
+    np.testing.assert_allclose(np.concatenate(blocks), one_shot, rtol=1e-10, atol=1e-12)
+
+
+def test_steady_state_start_has_no_step_transient():
+    # 以首个样本按稳态初始化：恒定输入的低通输出保持不变
+    data = np.full(500, 3.0)
+    filtered = StreamingFilter.iir(0, 50, 1000).process(data)
+    np.testing.assert_allclose(filtered, 3.0, rtol=1e-9)
+
+
+def test_low_pass_attenuates_high_frequency():
+    rate = 1000
+    t = np.arange(4000) / rate
+    low = np.sin(2 * np.pi * 5 * t)
+    high = np.sin(2 * np.pi * 300 * t)
+    filtered = StreamingFilter.iir(0, 50, rate).process(low + high)
+    amplitude = np.abs(np.fft.rfft(filtered[1000:])) * 2 / 3000
+    freq = np.fft.rfftfreq(3000, 1 / rate)
+    assert amplitude[freq == 5][0] == pytest.approx(1.0, abs=0.01)
+    assert amplitude[freq == 300][0] < 1e-3
+
+
+def test_empty_block_is_passed_through():
+    streaming = StreamingFilter.fir(0, 100, 1000)
+    assert len(streaming.process([])) == 0
+    assert streaming.zi is None
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from xiangmu_2 import WaveformStream as waveform_stream
+from xiangmu_2.WaveformStream import open_waveform_stream
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # 用很小的块验证跨块、跨遍的拼接
+    monkeypatch.setattr(waveform_stream, 'STREAM_CHUNK_SAMPLES', 7)
+    monkeypatch.setattr(waveform_stream, 'CSV_CHUNK_LINES', 5)
+
+
+def write_waveform(tmp_path, ext, values):
+    path = tmp_path / f'wave{ext}'
+    if ext == '.npy':
+        np.save(path, values)
+    elif ext == '.f32':
+        values.astype('<f4').tofile(path)
+    elif ext == '.bin':
+        values.astype('<f8').tofile(path)
+    else:
+        np.savetxt(path, values.reshape(-1, 1), delimiter=',')
+    return str(path)
+
+
+def drain(stream, total_cycles, count):
+    parts = []
+    while True:
+        chunk = stream.next_chunk(count, total_cycles)
+        if len(chunk) == 0:
+            return np.concatenate(parts) if parts else np.empty(0)
+        parts.append(chunk)
+
+
+@pytest.mark.parametrize('ext', ['.npy', '.f32', '.bin', '.csv'])
+@pytest.mark.parametrize('count', [1, 5, 64])
+def test_streams_whole_passes_in_order(tmp_path, small_chunks, ext, count):
+    values = np.arange(23, dtype=np.float64) * 0.5
+    stream = open_waveform_stream(write_waveform(tmp_path, ext, values))
+    try:
+        output = drain(stream, 3, count)
+    finally:
+        stream.close()
+    np.testing.assert_array_equal(output, np.tile(values, 3))
+
+
+@pytest.mark.parametrize('total_cycles, expected', [(1.5, 35), (0.01, 1), (2, 46)])
+def test_fractional_cycle_limit_rounds_up(tmp_path, small_chunks, total_cycles, expected):
+    values = np.arange(23, dtype=np.float64)
+    stream = open_waveform_stream(write_waveform(tmp_path, '.bin', values))
+    try:
+        output = drain(stream, total_cycles, 4)
+    finally:
+        stream.close()
+    assert len(output) == expected
+    np.testing.assert_array_equal(output, np.tile(values, 3)[:expected])
+
+
+def test_rewind_restarts_from_the_beginning(tmp_path, small_chunks):
+    values = np.arange(10, dtype=np.float64)
+    stream = open_waveform_stream(write_waveform(tmp_path, '.npy', values))
+    try:
+        stream.next_chunk(13)
+        stream.rewind()
+        np.testing.assert_array_equal(stream.next_chunk(4), values[:4])
+        assert stream.cycle_count == 0
+    finally:
+        stream.close()
+
+
+def test_unreadable_csv_reports_an_error(tmp_path, small_chunks):
+    path = tmp_path / 'bad.csv'
+    path.write_text('1.0\nnot a number\n')
+    stream = open_waveform_stream(str(path))
+    try:
+        with pytest.raises(IOError):
+            drain(stream, 1, 8)
+    finally:
+        stream.close()
@@ -0,0 +1,71 @@
+"""检查各模块的导入耗时和导入副作用。
+
+每个模块在独立的解释器中用 ``python -X importtime`` 导入，累计耗时超过预算，
+或者导入后 sys.modules 中出现了应当按需导入的重型模块/设备驱动时报告失败。
+
+用法（在项目根目录下）：
+    python tools/import_budget.py [模块名 ...]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+
+# 模块导入耗时预算（毫秒，累计值，含其依赖）
+IMPORT_BUDGETS_MS = {
+    'xiangmu_1.SensorPlot': 1000,
+    'xiangmu_2.SignalGenerator': 1000,
+    'xiangmu_3.DI_DO': 1000,
+    'xiangmu_1.DataLoader': 300,
+    'xiangmu_1.Spectrum': 300,
+    'xiangmu_1.StreamingFilter': 300,
+}
+
+# 导入上述模块时不应被加载的模块：只在实际用到的代码路径中导入
+DEFERRED_MODULES = ('Automation', 'pandas', 'matplotlib.pyplot', 'scipy')
+
+
+def measure(module):
+    """返回 (累计导入耗时毫秒, 已加载的延迟模块列表)"""
+    code = ('import sys, {0}; print(",".join(name for name in {1!r} if name in sys.modules))'
+            .format(module, DEFERRED_MODULES))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    if cumulative_us is None:
+        raise RuntimeError('no import time reported')
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative_us / 1000, loaded
+
+
+def main(modules):
+    failed = False
+    for module in modules:
+        budget = IMPORT_BUDGETS_MS.get(module)
+        try:
+            elapsed, loaded = measure(module)
+        except RuntimeError as e:
+            print(f'{module}: import failed ({e})')
+            failed = True
+            continue
+        status = 'ok'
+        if budget is not None and elapsed > budget:
+            status = f'over budget ({budget} ms)'
+            failed = True
+        if loaded:
+            status = f'imports {", ".join(loaded)} eagerly'
+            failed = True
+        print(f'{module}: {elapsed:.1f} ms {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:] or list(IMPORT_BUDGETS_MS)))
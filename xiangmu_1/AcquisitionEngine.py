@@ -0,0 +1,169 @@
+import time
+import numpy as np
+from threading import Lock
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from common.DeadlineTimer import DeadlineTimer
+from xiangmu_1.StreamRecorder import StreamRecorder
+
+CHANNEL_COUNT = 8
+MAX_SAMPLING_RATE = 1000
+# 采集到的帧按该间隔批量分发，避免高采样率下每帧一次跨线程信号
+EMIT_INTERVAL_NS = 10_000_000
+
+
+class AcquisitionEngine(QThread):
+    """共享的8通道AI采集线程：每个采样周期只调用一次 readDataF64(0, 8)，
+    整帧只打一次时间戳，然后分发给所有订阅的 SensorPlot。
+
+    采样按 DeadlineTimer 的绝对截止时间进行，每帧的时间戳为该帧计划的
+    截止时间（单调时钟 time.perf_counter_ns()），不含读设备的耗时抖动，
+    也不受系统时间调整影响。
+
+    设备由 open_ai_ctrl() 在采集线程第一次运行时才打开，创建引擎本身
+    不会访问硬件；stop() 结束线程并释放设备。
+    """
+    # (timestamps: shape (n,), frames: shape (n, CHANNEL_COUNT))
+    frames_ready = pyqtSignal(object, object)
+    sampling_rate_changed = pyqtSignal(int)
+    # 录制开始/结束：录制文件的时间基准固定，录制期间不能修改采样率
+    recording_changed = pyqtSignal(bool)
+
+    def __init__(self, open_ai_ctrl, sampling_rate=100):
+        super().__init__()
+        self.open_ai_ctrl = open_ai_ctrl
+        self.ai_ctrl = None
+        self.sampling_rate = sampling_rate
+        self.subscribers = []
+        self.running = False  # 有订阅者或正在录制时采样，否则空转
+        self.stopping = False  # stop() 请求线程退出
+        self.start_ns = time.perf_counter_ns()
+        self.deadline = DeadlineTimer(sampling_rate)
+        self.recorder = None
+        # 已采集、尚未分发的一批帧；stop_recording 时由界面线程写入录制文件，受 lock 保护
+        self.batch_timestamps = []
+        self.batch_frames = []
+        self.lock = Lock()
+
+    def subscribe(self, subscriber):
+        """订阅采集数据，subscriber 需要实现 on_frames(timestamps, frames)"""
+        with self.lock:
+            if subscriber in self.subscribers:
+                return
+            self.subscribers.append(subscriber)
+            self.frames_ready.connect(subscriber.on_frames)
+            self.running = True
+        self.ensure_started()
+
+    def ensure_started(self):
+        if not self.isRunning():
+            self.stopping = False
+            self.start()
+
+    def stop(self):
+        """结束采集线程并释放 AI 设备，未写完的录制数据写入文件"""
+        self.stopping = True
+        self.wait()
+        self.stop_recording()
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            if subscriber not in self.subscribers:
+                return
+            self.subscribers.remove(subscriber)
+            self.frames_ready.disconnect(subscriber.on_frames)
+            self.running = len(self.subscribers) > 0 or self.recorder is not None
+
+    def has_subscribers(self):
+        return len(self.subscribers) > 0
+
+    def is_recording(self):
+        return self.recorder is not None
+
+    def set_sampling_rate(self, sampling_rate):
+        # 加载的文件可能带有非整数或超出范围的采样率
+        sampling_rate = int(round(max(1, min(MAX_SAMPLING_RATE, sampling_rate))))
+        if sampling_rate == self.sampling_rate:
+            return
+        if self.is_recording():
+            # 录制文件头中的采样率不可更改：拒绝修改，并让界面恢复为当前采样率
+            self.sampling_rate_changed.emit(self.sampling_rate)
+            return
+        self.sampling_rate = sampling_rate
+        self.sampling_rate_changed.emit(sampling_rate)
+
+    def start_recording(self, path, compress=False):
+        """开始把所有通道的每一帧连续写入文件，录制期间即使没有订阅者也保持采集"""
+        recorder = StreamRecorder(path, CHANNEL_COUNT, self.sampling_rate, compress=compress)
+        recorder.start()
+        with self.lock:
+            self.recorder = recorder
+            self.running = True
+        self.ensure_started()
+        self.recording_changed.emit(True)
+
+    def stop_recording(self):
+        """停止录制，返回录制器以便查询写入/丢弃的帧数"""
+        with self.lock:
+            recorder = self.recorder
+            self.recorder = None
+            self.running = len(self.subscribers) > 0
+            if recorder is not None and self.batch_frames:
+                # 采集线程尚未分发的帧也写入文件
+                recorder.write(np.array(self.batch_timestamps),
+                               np.array(self.batch_frames, dtype=np.float64))
+        if recorder is not None:
+            recorder.stop()
+            self.recording_changed.emit(False)
+        return recorder
+
+    @property
+    def missed_deadlines(self):
+        return self.deadline.missed
+
+    def run(self):
+        try:
+            if self.ai_ctrl is None:
+                self.ai_ctrl = self.open_ai_ctrl()
+            self.acquire()
+        finally:
+            # 线程退出（包括异常）时都释放设备
+            if self.ai_ctrl is not None:
+                self.ai_ctrl.dispose()
+                self.ai_ctrl = None
+
+    def acquire(self):
+        from Automation.BDaq.BDaqApi import BioFailed
+        last_emit_ns = time.perf_counter_ns()
+        while not self.stopping:
+            if self.running:
+                if self.deadline.rate != self.sampling_rate:
+                    self.deadline.set_rate(self.sampling_rate)
+                deadline_ns = self.deadline.wait()
+
+                ret, scaled_data = self.ai_ctrl.readDataF64(0, CHANNEL_COUNT)
+                # 整帧共用一个时间戳，所有通道时间基准一致；时间戳取计划的截止时间，
+                # 读设备的耗时和唤醒延迟不会叠加到时间轴上
+                now_ns = time.perf_counter_ns()
+                if not BioFailed(ret):
+                    with self.lock:
+                        self.batch_timestamps.append((deadline_ns - self.start_ns) / 1e9)
+                        self.batch_frames.append(scaled_data[:CHANNEL_COUNT])
+
+                if self.batch_frames and now_ns - last_emit_ns >= EMIT_INTERVAL_NS:
+                    # write() 只做内存追加和非阻塞入队，持锁时间很短
+                    with self.lock:
+                        timestamps_np = np.array(self.batch_timestamps)
+                        frames_np = np.array(self.batch_frames, dtype=np.float64)
+                        self.batch_timestamps = []
+                        self.batch_frames = []
+                        if self.recorder is not None:
+                            self.recorder.write(timestamps_np, frames_np)
+                    self.frames_ready.emit(timestamps_np, frames_np)
+                    last_emit_ns = now_ns
+            else:
+                with self.lock:
+                    self.batch_timestamps = []
+                    self.batch_frames = []
+                self.msleep(50)  # 无订阅者时降低资源占用
+                self.deadline.set_rate(self.sampling_rate)  # 恢复采集时重新对齐截止时间
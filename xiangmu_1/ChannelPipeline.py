@@ -0,0 +1,69 @@
+from xiangmu_1.Decimation import decimate
+
+
+class ChannelPipeline:
+    """单通道的惰性处理流水线。
+
+    由一个数据源和若干有序的处理阶段组成，数据源为 source(**params)，
+    处理阶段为 func(times, values, **params)，都返回 (times, values)。
+    各阶段的输出在读取时才计算并缓存；数据源有新样本或某阶段参数变化时，
+    只有该阶段及其下游失效，下次读取从第一个失效的阶段开始重算。
+    处理阶段不修改输入数组，原始数据始终保留。
+    """
+
+    def __init__(self, source, **params):
+        self.names = ['source']
+        self.funcs = [source]
+        self.params = [params]
+        self.outputs = []  # 已计算且有效的各阶段输出，按阶段顺序
+
+    def add_stage(self, name, func, **params):
+        self.names.append(name)
+        self.funcs.append(func)
+        self.params.append(params)
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def invalidate(self, name='source'):
+        """使指定阶段及其下游的缓存输出失效"""
+        del self.outputs[self.index(name):]
+
+    def set_params(self, name, **params):
+        """更新阶段参数，只有取值确实变化时才使该阶段及其下游失效"""
+        current = self.params[self.index(name)]
+        changed = {key: value for key, value in params.items()
+                   if key not in current or current[key] != value}
+        if changed:
+            current.update(changed)
+            self.invalidate(name)
+
+    def get_param(self, name, key):
+        return self.params[self.index(name)][key]
+
+    def key(self, name=None):
+        """到指定阶段为止的全部参数，可作为该阶段输出的缓存键的一部分"""
+        last = self.index(name) if name is not None else len(self.names) - 1
+        return tuple((self.names[i], tuple(sorted(self.params[i].items()))) for i in range(last + 1))
+
+    def output(self, name=None):
+        """返回指定阶段（默认最后一个）的输出，按需计算失效的阶段"""
+        last = self.index(name) if name is not None else len(self.names) - 1
+        while len(self.outputs) <= last:
+            i = len(self.outputs)
+            if i == 0:
+                result = self.funcs[0](**self.params[0])
+            else:
+                result = self.funcs[i](*self.outputs[i - 1], **self.params[i])
+            self.outputs.append(result)
+        return self.outputs[last]
+
+
+def scale_stage(times, values, factor=1):
+    if factor == 1:
+        return times, values
+    return times, values * factor
+
+
+def decimate_stage(times, values, n_columns=0, method='minmax'):
+    return decimate(times, values, n_columns, method)
@@ -0,0 +1,77 @@
+import os
+import numpy as np
+
+from xiangmu_1.StreamRecorder import RecordingReader, RECORDING_SUFFIX
+
+DATA_FILE_FILTER = f"Data Files (*.csv *.npy *.bin *{RECORDING_SUFFIX});;All Files (*)"
+
+
+class ArraySeries:
+    """按固定采样率排列的一维数据（可以是 np.memmap），时间轴隐式为 i / sampling_rate。
+
+    window() 只切出并实际读取请求的时间范围，文件再大也只加载可见部分。
+    """
+    CHUNK_SAMPLES = 1 << 20
+
+    def __init__(self, values, sampling_rate, path=None, channel=0):
+        self.values = values
+        self.sampling_rate = sampling_rate
+        self.path = path
+        self.channel = channel
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def start_time(self):
+        return 0.0
+
+    @property
+    def end_time(self):
+        return max(len(self.values) - 1, 0) / self.sampling_rate
+
+    def window(self, t_start, t_end):
+        start = max(int(np.ceil(t_start * self.sampling_rate)), 0)
+        stop = min(int(np.floor(t_end * self.sampling_rate)) + 1, len(self.values))
+        if stop <= start:
+            return np.empty(0), np.empty(0)
+        times = np.arange(start, stop) / self.sampling_rate
+        return times, np.asarray(self.values[start:stop], dtype=np.float64)
+
+    def iter_chunks(self):
+        """按块顺序遍历全部数据，用于构建金字塔等一次性处理"""
+        for start in range(0, len(self.values), self.CHUNK_SAMPLES):
+            stop = min(start + self.CHUNK_SAMPLES, len(self.values))
+            yield np.arange(start, stop) / self.sampling_rate, np.asarray(self.values[start:stop])
+
+    def close(self):
+        # np.memmap 没有显式关闭接口，释放引用后由 numpy 解除映射
+        self.values = np.empty(0)
+
+
+def load_csv(path):
+    """向量化读取 save_data 导出的单列 CSV（第一行为标题）"""
+    return np.loadtxt(path, delimiter=',', skiprows=1, usecols=0, dtype=np.float64, ndmin=1)
+
+
+def open_series(path, channel, sampling_rate):
+    """按扩展名打开数据文件，返回支持 window(t_start, t_end) 的惰性数据源。
+
+    .airec 为 StreamRecorder 录制文件；.npy 以 mmap 方式打开（二维数组按列取通道）；
+    .bin 为原始 float64 小端数据；其余按 CSV 读取。
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == RECORDING_SUFFIX:
+        reader = RecordingReader(path)
+        return reader.channel(channel if channel < reader.channels else 0)
+    if ext == '.npy':
+        values = np.load(path, mmap_mode='r')
+        if values.ndim == 2:
+            channel = channel if channel < values.shape[1] else 0
+            values = values[:, channel]
+        else:
+            channel = 0
+        return ArraySeries(values, sampling_rate, path, channel)
+    if ext == '.bin':
+        return ArraySeries(np.memmap(path, dtype='<f8', mode='r'), sampling_rate, path)
+    return ArraySeries(load_csv(path), sampling_rate, path)
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def minmax_decimate(x, y, n_columns):
+    """按像素列分桶，每桶保留最小值和最大值两个点（保持时间顺序）。
+
+    输出点数约为 2 * n_columns，峰值和毛刺不会因抽取而丢失。
+    """
+    n = len(y)
+    if n_columns <= 0 or n <= 2 * n_columns:
+        return x, y
+    bucket = n // n_columns
+    usable = (n // bucket) * bucket
+    blocks = np.asarray(y[:usable]).reshape(-1, bucket)
+    base = np.arange(blocks.shape[0]) * bucket
+    i_min = blocks.argmin(axis=1) + base
+    i_max = blocks.argmax(axis=1) + base
+    index = np.column_stack((np.minimum(i_min, i_max), np.maximum(i_min, i_max))).ravel()
+    # 不足一个桶的尾部原样保留，保证最新样本一定被绘制
+    index = np.concatenate((index, np.arange(usable, n)))
+    return x[index], y[index]
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 抽取，保留视觉形状最显著的 n_out 个点"""
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+    x = np.asarray(x)
+    y = np.asarray(y)
+    # 首尾两点固定，其余 n_out - 2 个桶均分 [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    index = np.empty(n_out, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        xs = x[start:stop]
+        ys = y[start:stop]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        index[i + 1] = a
+    return x[index], y[index]
+
+
+def decimate(x, y, n_columns, method='minmax'):
+    """把数据抽取到与画布像素列数相当的点数，绘制开销与数据长度无关"""
+    if method == 'lttb':
+        return lttb(x, y, 2 * n_columns)
+    if method == 'minmax':
+        return minmax_decimate(x, y, n_columns)
+    return x, y
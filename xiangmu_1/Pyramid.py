@@ -0,0 +1,114 @@
+import os
+import numpy as np
+
+# 金字塔最细一层每块包含的样本数；更细的缩放直接读取原始数据
+BASE_BLOCK = 64
+PYRAMID_SUFFIX = '.pyramid.npz'
+
+
+class MinMaxPyramid:
+    """多分辨率最小/最大值金字塔。
+
+    第 k 层每块覆盖 BASE_BLOCK * 2**k 个样本，保存每块的起始时间、最小值和最大值。
+    查询时按每个像素对应的样本数选取合适的层，只切出可见范围内的块，
+    耗时与可见像素数成正比，与数据总长度无关。
+    """
+
+    def __init__(self, blocks, times, mins, maxs):
+        self.blocks = blocks  # 每层的块大小（样本数）
+        self.times = times
+        self.mins = mins
+        self.maxs = maxs
+
+    @classmethod
+    def build(cls, chunks, base_block=BASE_BLOCK):
+        """由 (时间戳, 数据) 块的迭代器一次遍历构建，内存占用约为数据量的 1 / base_block"""
+        times, mins, maxs = [], [], []
+        carry_t = np.empty(0)
+        carry_v = np.empty(0)
+        for chunk_times, chunk_values in chunks:
+            chunk_t = np.concatenate((carry_t, chunk_times))
+            chunk_v = np.concatenate((carry_v, np.asarray(chunk_values, dtype=np.float64)))
+            usable = (len(chunk_v) // base_block) * base_block
+            if usable > 0:
+                blocks = chunk_v[:usable].reshape(-1, base_block)
+                times.append(chunk_t[:usable:base_block])
+                mins.append(blocks.min(axis=1))
+                maxs.append(blocks.max(axis=1))
+            carry_t = chunk_t[usable:]
+            carry_v = chunk_v[usable:]
+        if len(carry_v) > 0:
+            times.append(carry_t[:1])
+            mins.append(carry_v.min(keepdims=True))
+            maxs.append(carry_v.max(keepdims=True))
+
+        level_times = [np.concatenate(times) if times else np.empty(0)]
+        level_mins = [np.concatenate(mins) if mins else np.empty(0)]
+        level_maxs = [np.concatenate(maxs) if maxs else np.empty(0)]
+        block_sizes = [base_block]
+        # 逐层两两合并
+        while len(level_mins[-1]) > 1:
+            t, lo, hi = level_times[-1], level_mins[-1], level_maxs[-1]
+            even = (len(lo) // 2) * 2
+            new_lo = lo[:even].reshape(-1, 2).min(axis=1)
+            new_hi = hi[:even].reshape(-1, 2).max(axis=1)
+            if even < len(lo):
+                new_lo = np.append(new_lo, lo[-1])
+                new_hi = np.append(new_hi, hi[-1])
+            level_times.append(t[::2])
+            level_mins.append(new_lo)
+            level_maxs.append(new_hi)
+            block_sizes.append(block_sizes[-1] * 2)
+        return cls(block_sizes, level_times, level_mins, level_maxs)
+
+    def level_for(self, samples_per_pixel):
+        """选取块大小不超过每像素样本数的最粗一层，没有合适的层时返回 None"""
+        level = None
+        for k, block in enumerate(self.blocks):
+            if block <= samples_per_pixel:
+                level = k
+        return level
+
+    def envelope(self, t_start, t_end, n_pixels, sampling_rate):
+        """返回可见范围的 (时间, 包络) 折线，每块输出最小、最大两个点"""
+        samples_per_pixel = (t_end - t_start) * sampling_rate / max(n_pixels, 1)
+        level = self.level_for(samples_per_pixel)
+        if level is None:
+            return None
+        times = self.times[level]
+        start = max(int(np.searchsorted(times, t_start, side='right')) - 1, 0)
+        stop = int(np.searchsorted(times, t_end, side='right'))
+        t = times[start:stop]
+        y = np.column_stack((self.mins[level][start:stop], self.maxs[level][start:stop])).ravel()
+        return np.repeat(t, 2), y
+
+    def save(self, path, source_path):
+        stat = os.stat(source_path)
+        arrays = {'blocks': np.array(self.blocks),
+                  'source_size': np.array(stat.st_size),
+                  'source_mtime': np.array(stat.st_mtime_ns)}
+        for k in range(len(self.blocks)):
+            arrays[f'times_{k}'] = self.times[k]
+            arrays[f'mins_{k}'] = self.mins[k]
+            arrays[f'maxs_{k}'] = self.maxs[k]
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path, source_path):
+        """读取持久化的金字塔；源文件已变化或不存在缓存时返回 None"""
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(source_path)
+        with np.load(path) as arrays:
+            if int(arrays['source_size']) != stat.st_size or int(arrays['source_mtime']) != stat.st_mtime_ns:
+                return None
+            blocks = arrays['blocks'].tolist()
+            return cls(blocks,
+                       [arrays[f'times_{k}'] for k in range(len(blocks))],
+                       [arrays[f'mins_{k}'] for k in range(len(blocks))],
+                       [arrays[f'maxs_{k}'] for k in range(len(blocks))])
+
+
+def pyramid_path(source_path, channel):
+    """金字塔缓存文件保存在数据文件旁边，每个通道一个"""
+    return f'{source_path}.ch{channel}{PYRAMID_SUFFIX}'
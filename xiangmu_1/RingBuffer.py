@@ -0,0 +1,124 @@
+import itertools
+
+import numpy as np
+
+# 全局递增的版本号，不同缓冲区之间也不会重复，可直接用作缓存键
+_generations = itertools.count(1)
+
+
+class RingBuffer:
+    """预分配、固定容量的 float64 环形缓冲区。
+
+    第0列为时间戳，其余 columns 列为数据，按列存储。每列内部长度为
+    2 * capacity，每个样本同时写入 i 和 i + capacity 两个位置，因此任意一列
+    最近的 N 个样本始终是一段连续内存，可以直接返回零拷贝的视图。
+    追加操作为 O(1)。
+    """
+
+    def __init__(self, capacity, columns=1):
+        self.capacity = max(int(capacity), 1)
+        self.columns = columns
+        self._storage = np.zeros((columns + 1, 2 * self.capacity), dtype=np.float64)
+        self._head = 0  # 下一个写入位置，范围 [0, capacity)
+        self._size = 0
+        self.generation = next(_generations)  # 追加或清空时更新，供缓存判断数据是否变化
+        self.column_generations = [0] * columns  # write_column 覆盖某一列时更新
+
+    @classmethod
+    def from_arrays(cls, timestamps, *columns):
+        """由已有数组构造一个恰好装满的缓冲区"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        buffer = cls(len(timestamps), columns=len(columns))
+        buffer.extend(timestamps, np.column_stack(columns))
+        return buffer
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.generation = next(_generations)
+
+    def version(self, column=0):
+        """某一数据列内容的版本，内容不变时版本不变"""
+        return self.generation, self.column_generations[column]
+
+    def ensure_capacity(self, capacity):
+        """容量不足时重新分配存储并保留已有数据"""
+        if capacity <= self.capacity:
+            return
+        rows = self._rows(self._size).copy()
+        self.capacity = int(capacity)
+        self._storage = np.zeros((self.columns + 1, 2 * self.capacity), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        if rows.shape[1] > 0:
+            self._write(rows)
+
+    def append(self, timestamp, *values):
+        row = np.empty((self.columns + 1, 1), dtype=np.float64)
+        row[0, 0] = timestamp
+        row[1:, 0] = values
+        self._write(row)
+
+    def extend(self, timestamps, values):
+        """批量追加，values 形状为 (n,) 或 (n, columns)"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        n = len(timestamps)
+        if n == 0:
+            return
+        rows = np.empty((self.columns + 1, n), dtype=np.float64)
+        rows[0] = timestamps
+        rows[1:] = np.asarray(values, dtype=np.float64).reshape(n, -1).T
+        self._write(rows)
+
+    def _write(self, rows):
+        if rows.shape[1] > self.capacity:
+            rows = rows[:, -self.capacity:]
+        n = rows.shape[1]
+        first = min(n, self.capacity - self._head)
+        end = self._head + first
+        # 两份镜像同时写入
+        self._storage[:, self._head:end] = rows[:, :first]
+        self._storage[:, self._head + self.capacity:end + self.capacity] = rows[:, :first]
+        if first < n:
+            rest = n - first
+            self._storage[:, :rest] = rows[:, first:]
+            self._storage[:, self.capacity:self.capacity + rest] = rows[:, first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        self.generation = next(_generations)
+
+    def _rows(self, count):
+        end = self._head + self.capacity
+        return self._storage[:, end - count:end]
+
+    def times(self):
+        """全部有效样本的时间戳（零拷贝视图）"""
+        return self._rows(self._size)[0]
+
+    def values(self, column=0):
+        """全部有效样本中指定数据列（零拷贝视图）"""
+        return self._rows(self._size)[column + 1]
+
+    def last_seconds(self, seconds, column=0):
+        """返回最近 seconds 秒内的 (时间戳, 数据) 连续视图"""
+        rows = self._rows(self._size)
+        times = rows[0]
+        if len(times) == 0:
+            return times, rows[column + 1]
+        start = np.searchsorted(times, times[-1] - seconds, side='left')
+        return times[start:], rows[column + 1, start:]
+
+    def write_column(self, column, values):
+        """覆盖最近 len(values) 个样本的某一数据列（两份镜像都会更新）"""
+        values = np.asarray(values, dtype=np.float64)
+        n = min(len(values), self._size)
+        if n == 0:
+            return
+        values = values[-n:]
+        positions = (self._head - n + np.arange(n)) % self.capacity
+        self._storage[column + 1, positions] = values
+        self._storage[column + 1, positions + self.capacity] = values
+        self.column_generations[column] = next(_generations)
@@ -2,7 +2,8 @@ import csv
 import numpy as np
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QScrollArea, QVBoxLayout, QWidget, QGridLayout,
-                             QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QSlider, QLabel,QLineEdit)
+                             QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QSlider, QLabel,QLineEdit,
+                             QCheckBox, QComboBox)
 from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -13,16 +14,21 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 
 
-from Automation.BDaq import *
-from Automation.BDaq.InstantAiCtrl import InstantAiCtrl
+from xiangmu_1.AcquisitionEngine import AcquisitionEngine, MAX_SAMPLING_RATE
+from xiangmu_1.RingBuffer import RingBuffer
+from xiangmu_1.StreamRecorder import RECORDING_SUFFIX
+from xiangmu_1.DataLoader import open_series, DATA_FILE_FILTER
+from xiangmu_1.ChannelPipeline import ChannelPipeline, scale_stage, decimate_stage
+from xiangmu_1.Pyramid import MinMaxPyramid, pyramid_path
+from xiangmu_1.StreamingFilter import StreamingFilter
+from xiangmu_1.Spectrum import spectrum, fft_filter, batch_fft_filter, StreamingSTFT
+from common.DisplayScheduler import get_display_scheduler
+from common.ResultCache import get_result_cache
+from common.StripChart import StripChart, DEFAULT_PLOT_BACKEND
 
 deviceDescription = "USB-4704,BID#0"
 profilePath = u"../../profile/DemoDevice.xml"
-ret = ErrorCode.Success
-instanceAiObj = InstantAiCtrl(deviceDescription)
-instanceAiObj.loadProfile = profilePath
 
-import time
 
 # def readAI():
 #     global count, ts
@@ -36,67 +42,150 @@ import time
 #
 #     return scaledData
 
-def readAI():
-    _, scaledData = instanceAiObj.readDataF64(0, 8)
-    return scaledData
+# 缓冲区列：原始数据 / 显示数据（滤波后）
+RAW_COLUMN = 0
+DATA_COLUMN = 1
+MAX_TIME_LIMIT = 50
+# 已加载数据的可见窗口超过该样本数时改用金字塔包络显示
+MAX_WINDOW_SAMPLES = 1_000_000
+SPECTROGRAM_DYNAMIC_RANGE_DB = 60
+
+acquisition_engine = None
+
+
+def open_ai_ctrl():
+    """打开 AI 设备并加载配置，由采集线程在第一次开始采集时调用"""
+    from Automation.BDaq.InstantAiCtrl import InstantAiCtrl
+    ai_ctrl = InstantAiCtrl(deviceDescription)
+    ai_ctrl.loadProfile = profilePath
+    return ai_ctrl
+
+
+def get_acquisition_engine():
+    """所有 SensorPlot 共用一个采集引擎，每帧只读一次8个通道"""
+    global acquisition_engine
+    if acquisition_engine is None:
+        acquisition_engine = AcquisitionEngine(open_ai_ctrl)
+    return acquisition_engine
+
+
+def shutdown_acquisition_engine():
+    """停止共享的采集线程并释放 AI 设备，由窗口的关闭流程调用"""
+    if acquisition_engine is not None:
+        acquisition_engine.stop()
+
+
+def filter_bounds_error(lower_bound, upper_bound, sampling_rate):
+    """检查滤波频带，合法时返回 None，否则返回错误信息"""
+    if lower_bound >= upper_bound:
+        return "Upper bound must be greater than lower bound."
+    if lower_bound >= 0.5 * sampling_rate or upper_bound >= 0.5 * sampling_rate:
+        return "Filter frequency must be less than half the sampling rate."
+    return None
 
 
 class FilterThread(QThread):
-    filter_completed = pyqtSignal(list)
+    # (filtered_data, cache_key)
+    filter_completed = pyqtSignal(object, object)
 
-    def __init__(self, raw_data, lower_bound, upper_bound, sampling_rate):
+    def __init__(self, raw_data, lower_bound, upper_bound, sampling_rate, cache_key=None):
         super().__init__()
         self.raw_data = raw_data
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
         self.sampling_rate = sampling_rate
+        self.cache_key = cache_key
 
     def run(self):
-        # 将原始数据转换为 numpy 数组
-        raw_data_np = np.array(self.raw_data)
-        # 进行 FFT
-        fft_data = np.fft.fft(raw_data_np)
+        # 实数 FFT 上的理想滤波（低通或带通）
+        filtered_data = fft_filter(self.raw_data, self.lower_bound, self.upper_bound, self.sampling_rate)
+
+        # 发送滤波完成信号
+        self.filter_completed.emit(filtered_data, self.cache_key)
 
-        freq = np.fft.fftfreq(len(fft_data), d=1 / self.sampling_rate)
 
-        # 创建滤波器
-        ideal_filter = np.zeros_like(freq)
+class BatchFilterThread(QThread):
+    """所有通道一次性滤波：相同长度的通道在一次二维 FFT 中完成"""
+    filter_completed = pyqtSignal(object)
 
-        if self.lower_bound == 0:
-            # 低通滤波器
-            ideal_filter[freq <= self.upper_bound] = 1
-        else:
-            # 带通滤波器
-            ideal_filter[(freq >= self.lower_bound) & (freq <= self.upper_bound)] = 1
+    def __init__(self, channels, lower_bound, upper_bound, sampling_rates):
+        super().__init__()
+        self.channels = channels
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.sampling_rates = sampling_rates
 
-        # 应用滤波器
-        filtered_fft_data = fft_data * ideal_filter
+    def run(self):
+        self.filter_completed.emit(batch_fft_filter(self.channels, self.lower_bound, self.upper_bound,
+                                                    self.sampling_rates))
 
-        # 进行逆 FFT 得到滤波后的数据
-        filtered_data = np.fft.ifft(filtered_fft_data).real
 
-        # 发送滤波完成信号
-        self.filter_completed.emit(filtered_data.tolist())
+class PyramidThread(QThread):
+    """后台为已加载的数据构建最小/最大值金字塔，并保存在数据文件旁边"""
+    pyramid_ready = pyqtSignal(object, object)
+
+    def __init__(self, series):
+        super().__init__()
+        self.series = series
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def chunks(self):
+        # 取消后不再读取后续数据块，线程尽快结束
+        for chunk in self.series.iter_chunks():
+            if self.cancelled:
+                return
+            yield chunk
+
+    def run(self):
+        pyramid = MinMaxPyramid.build(self.chunks())
+        if self.cancelled:
+            return
+        if self.series.path is not None:
+            try:
+                pyramid.save(pyramid_path(self.series.path, self.series.channel), self.series.path)
+            except OSError:
+                pass  # 数据目录不可写时只在内存中使用
+        self.pyramid_ready.emit(self.series, pyramid)
 
 
 class SensorPlot(QWidget):
-    def __init__(self, parent, index):
+    def __init__(self, parent, index, plot_backend=None):
         super().__init__(parent)
         self.index = index
+        # 'qpainter' 时实时时域曲线改用 StripChart 绘制，其余显示仍使用 matplotlib
+        self.plot_backend = plot_backend or DEFAULT_PLOT_BACKEND
         self.is_running = False
-        self.data = []
-        self.raw_data = []
-        self.time_data = []
         self.time_limit = 10
         self.voltage_limit = 10
         self.sampling_rate = 100
+        self.buffer = RingBuffer(self.buffer_capacity(), columns=2)
+        self.recording = None  # 通过 read_data 加载的数据源，只按可见窗口读取
+        self.pyramid = None
+        self.pyramid_thread = None
+        self.recording_identity = None  # 加载时文件的 (修改时间, 大小)，同一路径重新录制后缓存键不同
+        self.overview = False  # 当前窗口是否为金字塔包络（非原始数据）
+        self.view_end = 0.0
+        self.view_span = self.time_limit
         self.current_scale = 1
         self.display_mode = 'time'
-
-
-        self.canvas = PlotCanvas(self, width=5, height=4)
-        self.canvas.setFixedWidth(600)
-        self.canvas.setFixedHeight(400)
+        self.decimation_method = 'minmax'  # 'minmax' / 'lttb' / None
+        # 缓冲区窗口 → 缩放 → 离线滤波 → 抽取，各阶段按需计算并缓存
+        self.pipeline = ChannelPipeline(self.read_window, column=DATA_COLUMN, span=self.window_span())
+        self.pipeline.add_stage('scale', scale_stage, factor=1)
+        self.pipeline.add_stage('filter', self.filter_stage, bounds=None)
+        self.pipeline.add_stage('decimate', decimate_stage, n_columns=0, method=self.decimation_method)
+        self.plot_dirty = False
+        self.hover_time = None
+
+
+        # matplotlib 画布在首次显示后才创建（见 showEvent），此前用同尺寸的占位控件
+        self.plot_canvas = None
+        self.canvas_placeholder = QWidget(self)
+        self.canvas_placeholder.setFixedWidth(600)
+        self.canvas_placeholder.setFixedHeight(400)
         self.start_button = QPushButton('Start', self)
         self.start_button.setFixedWidth(80)
         self.start_button.setFixedHeight(30)
@@ -143,6 +232,20 @@ class SensorPlot(QWidget):
         self.fft_button.setEnabled(False)
         self.fft_button.clicked.connect(self.toggle_fft)
 
+        self.spectrogram_button = QPushButton('Spectrogram', self)
+        self.spectrogram_button.setFixedWidth(140)
+        self.spectrogram_button.setFixedHeight(30)
+        self.spectrogram_button.setEnabled(False)
+        self.spectrogram_button.clicked.connect(self.toggle_spectrogram)
+        self.stft = None  # 频谱图模式下的增量 STFT
+
+        # 采集过程中实时应用的流式滤波器
+        self.live_filter = None
+        self.live_filter_combo = QComboBox(self)
+        self.live_filter_combo.addItems(['Live Filter: Off', 'Live Filter: IIR', 'Live Filter: FIR'])
+        self.live_filter_combo.setFixedWidth(140)
+        self.live_filter_combo.currentIndexChanged.connect(self.on_live_filter_changed)
+
         self.lower_bound_slider = QSlider(Qt.Horizontal, self)
         self.lower_bound_slider.setMinimum(0)
         self.lower_bound_slider.setMaximum(499)
@@ -175,7 +278,7 @@ class SensorPlot(QWidget):
 
         self.sampling_slider = QSlider(Qt.Horizontal, self)
         self.sampling_slider.setMinimum(1)
-        self.sampling_slider.setMaximum(100)
+        self.sampling_slider.setMaximum(MAX_SAMPLING_RATE)
         self.sampling_slider.setValue(self.sampling_rate)
         self.sampling_slider.valueChanged.connect(self.update_sampling_rate)
 
@@ -222,7 +325,16 @@ class SensorPlot(QWidget):
         self.info_label = QLabel("Hover over a data point to see its value", self)
 
         canvas_layout = QVBoxLayout()  # 修改为垂直布局
-        canvas_layout.addWidget(self.canvas)  # 添加画布
+        canvas_layout.addWidget(self.canvas_placeholder)  # 添加画布
+        self.strip_chart = None
+        if self.plot_backend == 'qpainter':
+            self.strip_chart = StripChart(self, window=self.time_limit, history=MAX_TIME_LIMIT,
+                                          ylim=(-self.voltage_limit, self.voltage_limit), xlabel='Time (s)')
+            self.strip_chart.setFixedWidth(600)
+            self.strip_chart.setFixedHeight(400)
+            self.strip_chart.hide()
+            canvas_layout.addWidget(self.strip_chart)
+        self.canvas_layout = canvas_layout
         canvas_layout.addWidget(self.info_label)  # 将信息标签添加到画布下方
 
         button_layout = QGridLayout()
@@ -246,6 +358,8 @@ class SensorPlot(QWidget):
         filter_layout.addWidget(self.lower_bound_slider, 1, 1)
         filter_layout.addWidget(self.upper_bound_label, 2, 0)
         filter_layout.addWidget(self.upper_bound_slider, 2, 1)
+        filter_layout.addWidget(self.live_filter_combo, 3, 0)
+        filter_layout.addWidget(self.spectrogram_button, 3, 1)
 
         slider_layout = QGridLayout()
         slider_layout.setSpacing(30)
@@ -280,20 +394,131 @@ class SensorPlot(QWidget):
 
         self.setLayout(layout)
 
+        get_acquisition_engine().sampling_rate_changed.connect(self.on_engine_sampling_rate_changed)
+        get_acquisition_engine().recording_changed.connect(self.on_recording_changed)
+        self.on_recording_changed(get_acquisition_engine().is_recording())
+
+    @property
+    def canvas(self):
+        if self.plot_canvas is None:
+            self.create_canvas()
+        return self.plot_canvas
+
+    def create_canvas(self):
+        """创建 matplotlib 画布并替换占位控件"""
+        if self.plot_canvas is not None:
+            return
+        self.plot_canvas = PlotCanvas(self, width=5, height=4)
+        self.plot_canvas.setFixedWidth(600)
+        self.plot_canvas.setFixedHeight(400)
+        self.canvas_layout.replaceWidget(self.canvas_placeholder, self.plot_canvas)
+        self.canvas_placeholder.deleteLater()
+        self.canvas_placeholder = None
+        self.plot_canvas.setVisible(not self.live_strip())
+
         # 连接 canvas 的 hover 事件
-        self.canvas.mpl_connect('motion_notify_event', self.on_hover)
+        self.plot_canvas.mpl_connect('motion_notify_event', self.on_hover)
+        self.plot_canvas.mpl_connect('scroll_event', self.on_scroll)
+
+    def live_strip(self):
+        """实时采集的时域曲线是否由 StripChart 显示"""
+        return self.strip_chart is not None and self.is_running and self.display_mode == 'time'
+
+    def sync_plot_widget(self):
+        # 在 StripChart 和 matplotlib 画布（或其占位控件）之间切换
+        if self.strip_chart is None:
+            return
+        live = self.live_strip()
+        self.strip_chart.setVisible(live)
+        (self.plot_canvas or self.canvas_placeholder).setVisible(not live)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.plot_canvas is None:
+            # 放到事件循环的下一轮，多个通道的画布逐个创建，窗口先完成绘制
+            QTimer.singleShot(0, self.create_canvas)
+
+    @property
+    def time_data(self):
+        """当前时间窗口内的时间戳"""
+        return self.processed()[0]
+
+    @property
+    def raw_data(self):
+        return self.buffer.last_seconds(self.window_span(), RAW_COLUMN)[1]
+
+    @property
+    def data(self):
+        """当前时间窗口内经过缩放和滤波的数据"""
+        return self.processed()[1]
+
+    def processed(self):
+        self.pipeline.set_params('source', span=self.window_span())
+        return self.pipeline.output('filter')
+
+    def read_window(self, column, span):
+        # 流水线的数据源：缓冲区中最近 span 秒的某一数据列（零拷贝视图）
+        return self.buffer.last_seconds(span, column)
+
+    def filter_stage(self, times, values, bounds=None):
+        if bounds is None:
+            return times, values
+        lower_bound, upper_bound = bounds
+        filtered_data = get_result_cache().get_or_compute(
+            self.filter_cache_key(bounds),
+            lambda: fft_filter(values, lower_bound, upper_bound, self.sampling_rate))
+        return times, filtered_data
+
+    def filter_input(self, lower_bound, upper_bound):
+        """离线滤波作用于原始数据列：切换流水线数据源后返回 (滤波输入, 缓存键)"""
+        self.pipeline.set_params('source', column=RAW_COLUMN, span=self.window_span())
+        return self.pipeline.output('scale')[1], self.filter_cache_key((lower_bound, upper_bound))
+
+    def window_span(self):
+        """可见窗口长度（秒）：实时采集为 time_limit，已加载数据可自由缩放"""
+        return self.view_span if self.recording is not None else self.time_limit
+
+    def data_key(self):
+        """窗口内原始数据的标识：已加载的文件按文件和窗口区间，其余按缓冲区版本"""
+        if self.recording is not None and self.recording.path is not None:
+            return (self.recording.path, self.recording_identity, self.recording.channel,
+                    self.view_end - self.view_span, self.view_end, self.overview)
+        return self.buffer.version(RAW_COLUMN), self.window_span()
+
+    def filter_cache_key(self, bounds):
+        # 最后一项为滤波频带，filter_completed 据此设置流水线参数
+        return 'filter', self.data_key(), self.sampling_rate, self.pipeline.key('scale'), bounds
+
+    def fft_cache_key(self):
+        return 'fft', self.data_key(), self.sampling_rate, self.pipeline.key('filter')
+
+    def buffer_capacity(self):
+        # 按最大时间窗口预留，留出25%余量应对时间戳抖动
+        return int(MAX_TIME_LIMIT * self.sampling_rate * 1.25) + 1
 
     def on_hover(self, event):
-        if event.inaxes == self.canvas.ax:  # 检查鼠标是否在绘图区域
-            xdata = event.xdata
-            if xdata is not None:
-                try:
-                # 找到最近的数据点
-                    closest_index = (np.abs(np.array(self.time_data) - xdata)).argmin()
-                    value = self.data[closest_index]
-                    self.info_label.setText(f"Time: {self.time_data[closest_index]:.2f}s, Value: {value:.2f}")
-                except:
-                    pass
+        # 只记录鼠标位置，实际查找按显示帧率在 render_frame 中进行
+        if event.inaxes == self.canvas.ax and event.xdata is not None and self.display_mode == 'time':
+            self.hover_time = event.xdata + self.canvas.x_offset  # 画布上的时间是相对最新样本的
+            get_display_scheduler().mark_dirty(self)
+
+    def resolve_hover(self):
+        """二分查找悬停时间两侧的样本并线性插值，抽取显示时也能给出准确读数"""
+        time_data = self.time_data
+        data = self.data
+        if len(time_data) == 0:
+            return
+        x = self.hover_time
+        i = int(np.searchsorted(time_data, x))
+        if i <= 0:
+            value = data[0]
+        elif i >= len(time_data):
+            value = data[-1]
+        else:
+            t0, t1 = time_data[i - 1], time_data[i]
+            ratio = (x - t0) / (t1 - t0) if t1 > t0 else 0.0
+            value = data[i - 1] + (data[i] - data[i - 1]) * ratio
+        self.info_label.setText(f"Time: {x:.2f}s, Value: {value:.2f}")
     def toggle(self):
         if self.is_running:
             self.stop()
@@ -303,49 +528,94 @@ class SensorPlot(QWidget):
     def start(self):
         self.is_running = True
         self.start_button.setText('Stop')
-        self.data.clear()
-        self.raw_data.clear()
-        self.time_data.clear()
+        self.release_recording()
+        self.overview = False
+        self.buffer = RingBuffer(self.buffer_capacity(), columns=2)
+        # 采集中显示实时滤波输出的数据列，不做缩放和离线滤波
+        self.pipeline.set_params('source', column=DATA_COLUMN)
+        self.pipeline.set_params('scale', factor=1)
+        self.pipeline.set_params('filter', bounds=None)
+        self.pipeline.invalidate()
+        self.current_scale = 1
         self.canvas.clear_data()
-        self.start_time = time.time()  # 记录开始时间
-        self.update_data()
+        if self.strip_chart is not None:
+            self.strip_chart.clear()
+        engine = get_acquisition_engine()
+        if not engine.has_subscribers():
+            engine.set_sampling_rate(self.sampling_rate)
+        # 采集引擎已在运行时沿用其采样率以保持统一的时间基准；引擎还会把
+        # 加载文件时采用的采样率限制在实时采集的范围内，这里同步回本控件
+        self.apply_sampling_rate(engine.sampling_rate)
+        self.update_live_filter()
+        engine.subscribe(self)
         self.scale_button.setEnabled(False)
         self.filter_button.setEnabled(False)
         self.restore_button.setEnabled(False)
-        self.fft_button.setEnabled(False)  # 开始时禁用 FFT 按钮
+        self.fft_button.setEnabled(True)  # 采集中也可切换实时频谱
+        self.spectrogram_button.setEnabled(True)
+        if self.stft is not None:
+            self.reset_stft()
         self.read_button.setEnabled(False)
+        self.sync_plot_widget()
 
 
-    def update_data(self):
+    def on_frames(self, timestamps, frames):
+        """接收采集引擎分发的数据帧，只取本通道的数据"""
         if self.is_running:
+            channel = frames[:, self.index]
+            # 显示数据列写入实时滤波结果（未启用时与原始数据相同）
+            filtered = self.live_filter.process(channel) if self.live_filter is not None else channel
+            self.buffer.extend(timestamps, np.column_stack((channel, filtered)))
+            self.pipeline.invalidate()
+            if self.stft is not None:
+                self.stft.push(filtered)  # 只变换新凑满的帧
+            if self.strip_chart is not None:
+                # 切换到频谱显示时也持续追加，切回时域时曲线完整
+                self.strip_chart.append(timestamps, filtered)
+            # 绘制交给显示调度器按帧率合并完成，不阻塞采样
+            self.plot_dirty = True
+            get_display_scheduler().mark_dirty(self)
+
+    def render_frame(self):
+        if self.plot_dirty:
+            self.plot_dirty = False
+            self.update_plot()
+        if self.hover_time is not None:
+            self.resolve_hover()
+            self.hover_time = None
 
-            new_data = readAI()[self.index]
-            self.data.append(new_data)
-            self.raw_data.append(new_data)
-            current_time = time.time() - self.start_time  # 计算相对时间
-            self.time_data.append(current_time)
-
-            if len(self.time_data) > 0 and (self.time_data[-1] > self.time_limit):
-                self.data.pop(0)
-                self.raw_data.pop(0)
-                self.time_data.pop(0)
+    def on_engine_sampling_rate_changed(self, value):
+        # 采集中的通道共享同一采样率
+        if self.is_running:
+            self.apply_sampling_rate(value)
 
-            self.update_plot()
-            QTimer.singleShot(int(1000 / self.sampling_rate), self.update_data)
+    def on_recording_changed(self, recording):
+        # 录制文件只有一个采样率，录制期间锁定采样率控件
+        self.sampling_slider.setEnabled(not recording)
+        self.sampling_input.setEnabled(not recording)
 
     def stop(self):
         self.is_running = False
+        get_acquisition_engine().unsubscribe(self)
         self.start_button.setText('Start')
         self.scale_button.setEnabled(True)
         self.filter_button.setEnabled(True)
         self.restore_button.setEnabled(True)
         self.fft_button.setEnabled(True)  # 停止时启用 FFT 按钮
+        self.spectrogram_button.setEnabled(True)
         self.read_button.setEnabled(True)
+        if self.strip_chart is not None:
+            # 采集期间 matplotlib 画布没有更新，停止后补绘一次
+            self.sync_plot_widget()
+            self.update_plot()
 
 
 
     def apply_filter(self):
         if not self.is_running:
+            if self.overview:
+                QMessageBox.warning(self, "Overview", "Zoom in to apply the filter to raw data.")
+                return
             if len(self.raw_data) < 2:
                 QMessageBox.warning(self, "Insufficient Data",
                                     "Not enough data to apply filter. Please collect more data.")
@@ -355,71 +625,143 @@ class SensorPlot(QWidget):
             upper_bound = self.upper_bound_slider.value()
 
             # 添加参数检查
-            if lower_bound >= upper_bound:
-                QMessageBox.warning(self, "Invalid Filter Parameters",
-                                    "Upper bound must be greater than lower bound.")
+            error = filter_bounds_error(lower_bound, upper_bound, self.sampling_rate)
+            if error is not None:
+                QMessageBox.warning(self, "Invalid Filter Parameters", error)
                 return
-            if lower_bound >= 0.5 * self.sampling_rate or upper_bound >= 0.5 * self.sampling_rate:
-                QMessageBox.warning(self, "Invalid Filter Parameters",
-                                    "Filter frequency must be less than half the sampling rate.")
+
+            # 同一窗口、同一频带的结果已缓存时直接复用
+            values, cache_key = self.filter_input(lower_bound, upper_bound)
+            filtered_data = get_result_cache().get(cache_key)
+            if filtered_data is not None:
+                self.filter_completed(filtered_data, cache_key)
                 return
 
             self.filter_button.setEnabled(False)  # Disable the button during filtering
-            self.filter_thread = FilterThread(self.raw_data, lower_bound, upper_bound, self.sampling_rate)
+            self.filter_thread = FilterThread(values, lower_bound, upper_bound, self.sampling_rate, cache_key)
             self.filter_thread.filter_completed.connect(self.filter_completed)
             self.filter_thread.start()
 
-    def filter_completed(self, filtered_data):
-        self.data = filtered_data
+    def filter_completed(self, filtered_data, cache_key):
+        if self.is_running:
+            # 滤波期间开始了采集：结果已过期，按钮由 stop() 恢复
+            return
+        if cache_key != self.filter_cache_key(cache_key[-1]):
+            # 滤波期间平移、缩放或加载了其他数据：丢弃结果，也不放入缓存
+            self.filter_button.setEnabled(True)
+            return
+        # 结果放入缓存后由流水线的滤波阶段取用，原始数据保持不变
+        get_result_cache().put(cache_key, filtered_data)
+        self.pipeline.set_params('filter', bounds=cache_key[-1])
+        self.refresh_stft()
         self.update_plot()
         self.filter_button.setEnabled(True)  # Re-enable the button after filtering
 
     def restore_data(self):
         if not self.is_running:
-            self.data = self.raw_data.copy()
+            self.pipeline.set_params('source', column=RAW_COLUMN)
+            self.pipeline.set_params('scale', factor=1)
+            self.pipeline.set_params('filter', bounds=None)
+            self.current_scale = 1
+            self.refresh_stft()
             self.update_plot()
 
     def toggle_fft(self):
-        if not self.is_running:
-            if len(self.data) < 2:
-                QMessageBox.warning(self, "Insufficient Data",
-                                    "Not enough data to compute FFT. Please collect more data.")
-                return
+        if self.overview:
+            QMessageBox.warning(self, "Overview", "Zoom in to compute the FFT of raw data.")
+            return
+        if not self.is_running and len(self.data) < 2:
+            QMessageBox.warning(self, "Insufficient Data",
+                                "Not enough data to compute FFT. Please collect more data.")
+            return
+
+        # 采集过程中频谱随显示帧实时刷新
+        self.display_mode = 'fft' if self.display_mode == 'time' else 'time'
+        self.stft = None
+        self.sync_plot_widget()
+        self.update_plot()
 
-            self.display_mode = 'fft' if self.display_mode == 'time' else 'time'
-            self.update_plot()
+    def toggle_spectrogram(self):
+        if self.overview:
+            QMessageBox.warning(self, "Overview", "Zoom in to compute the spectrogram of raw data.")
+            return
+        if self.display_mode == 'spectrogram':
+            self.display_mode = 'time'
+            self.stft = None
+        else:
+            self.display_mode = 'spectrogram'
+            self.reset_stft()
+        self.sync_plot_widget()
+        self.update_plot()
+
+    def reset_stft(self):
+        """按当前采样率和窗口长度重建 STFT，并一次性变换窗口内已有的数据"""
+        self.stft = StreamingSTFT(self.sampling_rate, self.window_span())
+        self.stft.push(self.data)
+
+    def refresh_stft(self):
+        # 窗口内数据被整体替换时重算频谱图
+        if self.stft is not None:
+            self.reset_stft()
 
     def update_plot(self):
         if self.display_mode == 'time':
-            self.canvas.update_plot(self.data, self.time_data, self.time_limit, self.voltage_limit)
+            self.plot_time()
         elif self.display_mode == 'fft':
             self.plot_fft()
+        elif self.display_mode == 'spectrogram':
+            self.plot_spectrogram()
 
-    def plot_fft(self):
-        if len(self.data) > 1:
-            # 进行FFT变换
-            fft_data = np.fft.fft(self.data)
+    def plot_spectrogram(self):
+        if self.stft is None:
+            self.reset_stft()
+        self.canvas.update_spectrogram(self.stft.image(), self.stft.extent(), self.window_span())
 
-            # 计算对应的频率
-            freq = np.fft.fftfreq(len(fft_data), d=1 / self.sampling_rate)
-            # 只取正频率部分（从0到采样率的一半）
-            positive_freq = freq[:len(freq) // 2]
-            magnitude = np.abs(fft_data)[:len(fft_data) // 2]
+    def plot_fft(self):
+        data = self.data
+        if len(data) > 1:
+            # 实数 FFT 只计算正频率部分；长数据使用 Welch 平均
+            if self.is_running:
+                freq, magnitude = spectrum(data, self.sampling_rate)
+            else:
+                # 停止后在时域/频域之间切换时复用已算过的频谱
+                freq, magnitude = get_result_cache().get_or_compute(
+                    self.fft_cache_key(), lambda: spectrum(data, self.sampling_rate))
 
             # 更新图像
-            self.canvas.update_plot_fft(positive_freq, magnitude, self.voltage_limit)
+            self.canvas.update_plot_fft(freq, magnitude, self.voltage_limit)
 
     def apply_scale(self):
         if not self.is_running:
+            # 只有缩放及其下游的滤波、抽取阶段需要重算
             self.current_scale = self.scale_slider.value()
-            scaled_data = [d * self.current_scale for d in self.data]
-            self.canvas.update_plot(scaled_data, self.time_data, self.time_limit, self.voltage_limit)
+            self.pipeline.set_params('scale', factor=self.current_scale)
+            self.refresh_stft()
+            self.update_plot()
+
+    def plot_time(self):
+        if self.live_strip():
+            # StripChart 只补画新到的样本，不经过处理流水线
+            self.strip_chart.set_window(self.window_span())
+            self.strip_chart.set_ylim(-self.voltage_limit, self.voltage_limit)
+            self.strip_chart.refresh()
+            return
+        # 按画布像素宽度抽取后再交给 matplotlib，绘制开销与窗口内样本数无关
+        self.pipeline.set_params('source', span=self.window_span())
+        self.pipeline.set_params('decimate', n_columns=self.canvas.pixel_width(), method=self.decimation_method)
+        time_data, data = self.pipeline.output()
+        self.canvas.update_plot(data, time_data, self.window_span(), self.voltage_limit)
 
     def update_scale_label(self):
         self.scale_label.setText(f'Scale: x{self.scale_slider.value()}')
 
     def update_time_limit(self, value):
         self.time_limit = value
+        if self.recording is not None:
+            self.view_span = value
+            self.clamp_view()
+            self.load_recording_window()
+        self.refresh_stft()
         self.update_plot()
 
     def update_voltage_limit(self, value):
@@ -428,14 +770,51 @@ class SensorPlot(QWidget):
 
     def update_sampling_rate(self, value):
         self.sampling_rate = value
+        self.buffer.ensure_capacity(self.buffer_capacity())
+        self.pipeline.invalidate()
+        if self.is_running:
+            get_acquisition_engine().set_sampling_rate(value)
+        self.update_live_filter()
+        self.refresh_stft()
+
+    def live_filter_error(self):
+        """检查实时滤波参数，合法时返回 None，否则返回错误信息"""
+        return filter_bounds_error(self.lower_bound_slider.value(), self.upper_bound_slider.value(),
+                                   self.sampling_rate)
+
+    def on_live_filter_changed(self, index):
+        if index != 0 and self.live_filter_error() is not None:
+            QMessageBox.warning(self, "Invalid Filter Parameters", self.live_filter_error())
+        self.update_live_filter()
+
+    def update_live_filter(self):
+        """按当前频带和采样率重建实时滤波器；参数不合法时暂停滤波"""
+        mode = self.live_filter_combo.currentIndex()
+        if mode == 0 or self.live_filter_error() is not None:
+            self.live_filter = None
+            return
+        lower_bound = self.lower_bound_slider.value()
+        upper_bound = self.upper_bound_slider.value()
+        try:
+            if mode == 1:
+                self.live_filter = StreamingFilter.iir(lower_bound, upper_bound, self.sampling_rate)
+            else:
+                self.live_filter = StreamingFilter.fir(lower_bound, upper_bound, self.sampling_rate)
+        except ImportError as e:
+            # 未安装 scipy：提示后关闭实时滤波
+            self.live_filter = None
+            QMessageBox.warning(self, "Live Filter Unavailable", str(e))
+            self.live_filter_combo.setCurrentIndex(0)
 
     def update_lower_bound_label(self):
         self.lower_bound_label.setText(f'Lower Bound: {self.lower_bound_slider.value()} Hz')
         self.lower_bound_input.setText(str(self.lower_bound_slider.value()))  # 同步到输入框
+        self.update_live_filter()
 
     def update_upper_bound_label(self):
         self.upper_bound_label.setText(f'Upper Bound: {self.upper_bound_slider.value()} Hz')
         self.upper_bound_input.setText(str(self.upper_bound_slider.value()))  # 同步到输入框
+        self.update_live_filter()
 
     def save_data(self):
         options = QFileDialog.Options()
@@ -446,28 +825,116 @@ class SensorPlot(QWidget):
                 with open(file_name, 'w', newline='') as csvfile:
                     csvwriter = csv.writer(csvfile)
                     csvwriter.writerow([f"Sensor {self.index + 1} Data"])
-                    csvwriter.writerows([[data] for data in self.data])
+                    csvwriter.writerows([[data] for data in self.data.tolist()])
                 QMessageBox.information(self, "Success", f"Sensor {self.index + 1} data saved successfully!")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save data: {str(e)}")
 
     def read_data(self):
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getOpenFileName(self, "Open CSV", "", "CSV Files (*.csv);;All Files (*)",
-                                                   options=options)
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Data", "", DATA_FILE_FILTER, options=options)
         if file_name:
+            self.release_recording()
             try:
-                with open(file_name, 'r') as csvfile:
-                    csvreader = csv.reader(csvfile)
-                    header = next(csvreader)  # 跳过标题行
-                    self.data = [float(row[0]) for row in csvreader]  # 假设每行只有一个数据点
-                    self.raw_data = self.data.copy()  # 如果有原始数据字段，可修改
-                    self.time_data = list(np.arange(0, len(self.data) / self.sampling_rate, 1 / self.sampling_rate))
-                    self.update_plot()
+                self.recording = open_series(file_name, self.index, self.sampling_rate)
+                stat = os.stat(file_name)
+                self.recording_identity = (stat.st_mtime_ns, stat.st_size)
+                if self.recording.sampling_rate != self.sampling_rate:
+                    self.apply_sampling_rate(self.recording.sampling_rate)
+                self.view_span = self.time_limit
+                self.view_end = self.recording.end_time
+                self.pyramid = None
+                if self.recording.path is not None:
+                    self.pyramid = MinMaxPyramid.load(pyramid_path(self.recording.path, self.recording.channel),
+                                                      self.recording.path)
+                if self.pyramid is None:
+                    self.pyramid_thread = PyramidThread(self.recording)
+                    self.pyramid_thread.pyramid_ready.connect(self.on_pyramid_ready)
+                    self.pyramid_thread.start()
+                self.load_recording_window()
+                self.refresh_stft()
+                self.update_plot()
                 QMessageBox.information(self, "Success", "Data loaded successfully!")
             except Exception as e:
+                self.release_recording()
                 QMessageBox.critical(self, "Error", f"Failed to read data: {str(e)}")
 
+    def apply_sampling_rate(self, rate):
+        """直接采用给定的采样率并同步控件（加载的数据或采集引擎的采样率）。
+
+        文件的采样率可以高于实时采集的上限 MAX_SAMPLING_RATE，也可以不是整数，
+        不能经过滑条设置（会被截断），滑条只显示其范围内最接近的值。
+        """
+        self.sampling_slider.blockSignals(True)
+        self.sampling_slider.setValue(int(round(min(rate, MAX_SAMPLING_RATE))))
+        self.sampling_slider.blockSignals(False)
+        self.sampling_input.setText(f'{rate:g}')
+        self.update_sampling_rate(rate)
+
+    def load_recording_window(self):
+        """只把已加载数据的可见窗口读入缓冲区；窗口过长时改用金字塔包络"""
+        t_start = self.view_end - self.view_span
+        self.overview = False
+        if self.view_span * self.recording.sampling_rate > MAX_WINDOW_SAMPLES and self.pyramid is not None:
+            envelope = self.pyramid.envelope(t_start, self.view_end, self.canvas.pixel_width(),
+                                             self.recording.sampling_rate)
+            if envelope is not None:
+                time_data, data = envelope
+                self.overview = True
+        if not self.overview:
+            time_data, data = self.recording.window(t_start, self.view_end)
+        self.buffer = RingBuffer.from_arrays(time_data, data, data)
+        # 新窗口按原始数据显示（离线滤波只作用于当时的窗口）
+        self.pipeline.set_params('filter', bounds=None)
+        self.pipeline.invalidate()
+
+    def release_recording(self):
+        """关闭已加载的数据源（文件句柄和映射），先停止仍在读取它的金字塔线程"""
+        self.cancel_pyramid_thread()
+        if self.recording is not None:
+            self.recording.close()
+            self.recording = None
+        self.pyramid = None
+
+    def cancel_pyramid_thread(self):
+        """停止仍在为上一个数据源构建金字塔的线程并等待其退出"""
+        if self.pyramid_thread is not None:
+            self.pyramid_thread.cancel()
+            self.pyramid_thread.wait()
+            self.pyramid_thread = None
+
+    def on_pyramid_ready(self, series, pyramid):
+        # 只接受当前数据源的结果
+        if series is self.recording:
+            self.pyramid = pyramid
+
+    def clamp_view(self):
+        """限制缩放和平移范围：没有金字塔时窗口不超过 MAX_WINDOW_SAMPLES"""
+        rate = self.recording.sampling_rate
+        start_time, end_time = self.recording.start_time, self.recording.end_time
+        max_span = max(end_time - start_time, 10 / rate)
+        if self.pyramid is None:
+            max_span = min(max_span, MAX_WINDOW_SAMPLES / rate)
+        self.view_span = min(max(self.view_span, 10 / rate), max_span)
+        self.view_end = min(max(self.view_end, start_time + self.view_span), end_time)
+
+    def on_scroll(self, event):
+        """已加载数据时：滚轮以鼠标位置为中心缩放，按住 Shift 滚动平移"""
+        if self.recording is None or self.is_running:
+            return
+        if event.key == 'shift':
+            self.view_end -= event.step * 0.1 * self.view_span
+        else:
+            anchor = event.xdata + self.canvas.x_offset if event.xdata is not None else self.view_end
+            old_span, old_end = self.view_span, self.view_end
+            self.view_span = old_span * 0.8 ** event.step
+            self.clamp_view()
+            self.view_end = anchor + (old_end - anchor) * self.view_span / old_span
+        self.clamp_view()
+        self.load_recording_window()
+        self.refresh_stft()
+        self.update_plot()
+
     def update_time_limit_from_input(self):
         try:
             value = int(self.time_input.text())
@@ -491,9 +958,11 @@ class SensorPlot(QWidget):
     def update_sampling_rate_from_input(self):
         try:
             value = int(self.sampling_input.text())
-            if 1 <= value <= 100:
+            if 1 <= value <= MAX_SAMPLING_RATE:
                 self.sampling_rate = value
                 self.sampling_slider.setValue(value)
+                if self.is_running:
+                    get_acquisition_engine().set_sampling_rate(value)
                 self.update_plot()
         except ValueError:
             pass  # Ignore invalid input
@@ -538,41 +1007,243 @@ class SensorPlot(QWidget):
             # 输入无效时恢复滑条值
             self.upper_bound_input.setText(str(self.upper_bound_slider.value()))
 
+class RecordingControl(QWidget):
+    """8通道连续录制控制：把采集引擎的每一帧流式写入磁盘"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.is_recording = False
+
+        self.record_button = QPushButton('Start Recording', self)
+        self.record_button.setFixedWidth(140)
+        self.record_button.setFixedHeight(30)
+        self.record_button.clicked.connect(self.toggle_recording)
+        self.compress_check = QCheckBox('Compress', self)
+        self.status_label = QLabel('Not recording', self)
+
+        layout = QHBoxLayout(self)
+        layout.addWidget(self.record_button)
+        layout.addWidget(self.compress_check)
+        layout.addWidget(self.status_label)
+        layout.addStretch()
+
+    def toggle_recording(self):
+        if self.is_recording:
+            self.stop_recording()
+        else:
+            self.start_recording()
+
+    def start_recording(self):
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(self, "Record Data", "",
+                                                   f"AI Recording (*{RECORDING_SUFFIX});;All Files (*)",
+                                                   options=options)
+        if file_name:
+            if not file_name.endswith(RECORDING_SUFFIX):
+                file_name += RECORDING_SUFFIX
+            try:
+                get_acquisition_engine().start_recording(file_name, compress=self.compress_check.isChecked())
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to start recording: {str(e)}")
+                return
+            self.is_recording = True
+            self.record_button.setText('Stop Recording')
+            self.compress_check.setEnabled(False)
+            self.status_label.setText(f'Recording to {os.path.basename(file_name)}')
+
+    def stop_recording(self):
+        recorder = get_acquisition_engine().stop_recording()
+        self.is_recording = False
+        self.record_button.setText('Start Recording')
+        self.compress_check.setEnabled(True)
+        if recorder is not None:
+            self.status_label.setText(f'Saved {recorder.frames_written} frames, '
+                                      f'dropped {recorder.dropped_frames}')
+            if recorder.error is not None:
+                QMessageBox.critical(self, "Error", f"Failed to write recording: {str(recorder.error)}")
+
+
+class BatchFilterControl(QWidget):
+    """传感器标签页上的“滤波所有通道”操作"""
+
+    def __init__(self, sensor_plots, parent=None):
+        super().__init__(parent)
+        self.sensor_plots = sensor_plots
+
+        self.lower_bound_input = QLineEdit('0', self)
+        self.lower_bound_input.setFixedWidth(60)
+        self.upper_bound_input = QLineEdit('40', self)
+        self.upper_bound_input.setFixedWidth(60)
+        self.filter_button = QPushButton('Filter All Channels', self)
+        self.filter_button.setFixedWidth(140)
+        self.filter_button.setFixedHeight(30)
+        self.filter_button.clicked.connect(self.filter_all)
+
+        layout = QHBoxLayout(self)
+        layout.addWidget(QLabel('Lower Bound (Hz):', self))
+        layout.addWidget(self.lower_bound_input)
+        layout.addWidget(QLabel('Upper Bound (Hz):', self))
+        layout.addWidget(self.upper_bound_input)
+        layout.addWidget(self.filter_button)
+        layout.addStretch()
+
+    def filter_all(self):
+        try:
+            lower_bound = int(self.lower_bound_input.text())
+            upper_bound = int(self.upper_bound_input.text())
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Filter Parameters", "Please enter integer bounds.")
+            return
+
+        # 只处理已停止、数据足够且显示原始数据的通道
+        plots = [plot for plot in self.sensor_plots
+                 if not plot.is_running and not plot.overview and len(plot.raw_data) >= 2]
+        if not plots:
+            QMessageBox.warning(self, "Insufficient Data", "No stopped channel has enough data to filter.")
+            return
+        for plot in plots:
+            error = filter_bounds_error(lower_bound, upper_bound, plot.sampling_rate)
+            if error is not None:
+                QMessageBox.warning(self, "Invalid Filter Parameters", f"Sensor {plot.index + 1}: {error}")
+                return
+
+        # 结果已缓存的通道直接复用，其余通道一起送入批量滤波
+        cache = get_result_cache()
+        pending = []
+        for plot in plots:
+            values, cache_key = plot.filter_input(lower_bound, upper_bound)
+            filtered_data = cache.get(cache_key)
+            if filtered_data is not None:
+                plot.filter_completed(filtered_data, cache_key)
+            else:
+                pending.append((plot, values, cache_key))
+        if not pending:
+            return
+
+        self.filter_button.setEnabled(False)
+        self.target_plots = [(plot, cache_key) for plot, _, cache_key in pending]
+        self.filter_thread = BatchFilterThread([values for _, values, _ in pending], lower_bound, upper_bound,
+                                               [plot.sampling_rate for plot, _, _ in pending])
+        self.filter_thread.filter_completed.connect(self.filter_completed)
+        self.filter_thread.start()
+
+    def filter_completed(self, results):
+        for (plot, cache_key), filtered_data in zip(self.target_plots, results):
+            plot.filter_completed(filtered_data, cache_key)
+        self.filter_button.setEnabled(True)
+
+
 class PlotCanvas(FigureCanvas):
+    """持久化 Line2D + 背景缓存的增量绘图画布。
+
+    坐标轴、网格和标题只在模式或坐标范围变化时完整重绘一次并缓存背景，
+    其余帧只恢复背景、重画数据线并 blit 数据区域。
+    """
+
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         self.ax = self.fig.add_subplot(111)
         super(PlotCanvas, self).__init__(self.fig)
         self.setParent(parent)
 
-    def update_plot(self, data, time_data, time_limit, voltage_limit):
-        self.ax.cla()
-        self.ax.set_title(f"Sensor Data")
-        self.ax.set_ylim(-voltage_limit, voltage_limit)
-        self.ax.grid(True)
+        self.mode = None  # 当前绘图模式：'time' / 'fft' / 'spectrogram'
+        self.limits = None  # 当前坐标范围 (xlim, ylim, extent)
+        self.line = None
+        self.image = None
+        self.artist = None  # 当前模式下逐帧更新的 artist
+        self.background = None
+        self.x_offset = 0.0  # 时域图以最新时间为 0，悬停时需加回该偏移
 
-        if len(time_data) > 0:
-            self.ax.set_xlim(time_data[-1] - time_limit, time_data[-1])
+        self.mpl_connect('draw_event', self.on_draw)
 
-        self.ax.plot(time_data, data, 'b-')
-        self.ax.xaxis.set_ticklabels([])
+    def on_draw(self, event):
+        """完整重绘后缓存背景，并把数据线/图像画回去"""
+        self.background = self.copy_from_bbox(self.ax.bbox)
+        if self.artist is not None:
+            self.ax.draw_artist(self.artist)
 
-        self.draw()
-
-    def update_plot_fft(self, freq, magnitude, voltage_limit):
+    def setup_axes(self, mode, xlim, ylim, extent=None):
+        """重建坐标轴和持久化的数据线/图像，只在模式或范围变化时调用"""
         self.ax.cla()
-        self.ax.set_title("FFT of Sensor Data")
-        self.ax.set_ylim(0, max(magnitude) * 1.1)
         self.ax.grid(True)
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*ylim)
+        self.line = None
+        self.image = None
+        if mode == 'time':
+            self.ax.set_title("Sensor Data")
+            self.ax.xaxis.set_ticklabels([])
+            self.line, = self.ax.plot([], [], 'b-', animated=True)
+        elif mode == 'fft':
+            self.ax.set_title("FFT of Sensor Data")
+            self.ax.set_xlabel('Frequency (Hz)')
+            self.ax.set_ylabel('Amplitude')
+            self.line, = self.ax.plot([], [], 'r-', animated=True)
+        else:
+            self.ax.set_title("Spectrogram of Sensor Data")
+            self.ax.set_ylabel('Frequency (Hz)')
+            self.ax.xaxis.set_ticklabels([])
+            self.image = self.ax.imshow(np.zeros((2, 2)), aspect='auto', origin='lower', extent=extent,
+                                        cmap='viridis', interpolation='nearest', animated=True)
+        self.artist = self.line if self.line is not None else self.image
+        self.mode = mode
+        self.limits = (xlim, ylim, extent)
+        self.background = None
+
+    def blit_artist(self):
+        if self.background is None:
+            self.draw()  # draw_event 中会缓存背景
+        else:
+            self.restore_region(self.background)
+            self.ax.draw_artist(self.artist)
+            self.blit(self.ax.bbox)
+
+    def render_line(self, mode, x, y, xlim, ylim):
+        if self.mode != mode or self.limits != (xlim, ylim, None):
+            self.setup_axes(mode, xlim, ylim)
+        self.line.set_data(x, y)
+        self.blit_artist()
+
+    def update_spectrogram(self, image, extent, time_limit):
+        """image 形状为 (频点数, 时间列数)，extent 为 (起始时间, 0, 0, 最高频率)"""
+        self.x_offset = 0.0
+        xlim = (-time_limit, 0)
+        ylim = (extent[2], extent[3])
+        if self.mode != 'spectrogram' or self.limits != (xlim, ylim, extent):
+            self.setup_axes('spectrogram', xlim, ylim, extent)
+        self.image.set_data(image)
+        peak = float(np.max(image)) if image.size > 0 else 0.0
+        self.image.set_clim(peak - SPECTROGRAM_DYNAMIC_RANGE_DB, peak)
+        self.blit_artist()
+
+    def pixel_width(self):
+        """数据区域的像素宽度，用于决定抽取后的点数"""
+        return max(int(self.ax.bbox.width), 1)
 
-        self.ax.plot(freq[:len(magnitude)], magnitude[:len(magnitude)], 'r-')
-        self.ax.set_xlabel('Frequency (Hz)')
-        self.ax.set_ylabel('Magnitude')
+    def update_plot(self, data, time_data, time_limit, voltage_limit):
+        # x 轴固定为 [-time_limit, 0]，数据整体平移，坐标轴无需每帧重绘
+        self.x_offset = float(time_data[-1]) if len(time_data) > 0 else 0.0
+        self.render_line('time', np.asarray(time_data) - self.x_offset, data,
+                         (-time_limit, 0), (-voltage_limit, voltage_limit))
 
-        self.draw()
+    def update_plot_fft(self, freq, magnitude, voltage_limit):
+        self.x_offset = 0.0
+        peak = float(np.max(magnitude)) * 1.1 if len(magnitude) > 0 else 1.0
+        upper = self.limits[1][1] if self.mode == 'fft' else 0.0
+        # 幅值上限留有回滞，避免每帧因微小变化而整图重绘
+        if not (0.5 * upper <= peak <= upper):
+            upper = peak if peak > 0 else 1.0
+        xlim = (0, float(freq[len(magnitude) - 1])) if len(magnitude) > 1 else (0, 1)
+        self.render_line('fft', freq[:len(magnitude)], magnitude, xlim, (0, upper))
 
     def clear_data(self):
         self.ax.cla()
+        self.mode = None
+        self.limits = None
+        self.line = None
+        self.image = None
+        self.artist = None
+        self.background = None
         self.draw()
 
 
@@ -593,10 +1264,15 @@ class App(QMainWindow):
 
         # 创建布局并添加到子控件
         layout = QVBoxLayout(central_widget)
+        layout.addWidget(RecordingControl(central_widget))
+        self.sensor_plots = []
+        batch_filter_control = BatchFilterControl(self.sensor_plots, central_widget)
+        layout.addWidget(batch_filter_control)
 
         # 添加SensorPlot实例到布局
         for i in range(8):
             sensor_plot = SensorPlot(central_widget, i)
+            self.sensor_plots.append(sensor_plot)
             layout.addWidget(sensor_plot)
 
         # 设置QScrollArea的WidgetResizable属性为True，这样QScrollArea会根据子控件的大小自动调整滚动条
@@ -605,6 +1281,12 @@ class App(QMainWindow):
         # 将QScrollArea设置为主窗口的中心控件
         self.setCentralWidget(scroll_area)
 
+    def closeEvent(self, event):
+        shutdown_acquisition_engine()
+        for sensor_plot in self.sensor_plots:
+            sensor_plot.release_recording()
+        super().closeEvent(event)
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,192 @@
+from functools import lru_cache
+
+import numpy as np
+
+# 数据长度超过该值时频谱视图改用 Welch 平均，曲线更平滑且点数有界
+WELCH_THRESHOLD = 8192
+WELCH_SEGMENT = 2048
+
+
+def next_fast_len(n):
+    """不小于 n 的最小 5-smooth 数（只含 2、3、5 因子），FFT 在该长度上最快"""
+    if n <= 6:
+        return max(n, 1)
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # 用 2 的幂补足到不小于 n
+            quotient = -(-n // p35)
+            candidate = p35 * (1 << (quotient - 1).bit_length())
+            if candidate < best:
+                best = candidate
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+@lru_cache(maxsize=64)
+def rfft_frequencies(n, sampling_rate):
+    """按 (长度, 采样率) 缓存的 rfft 频率轴（只读）"""
+    freq = np.fft.rfftfreq(n, d=1 / sampling_rate)
+    freq.setflags(write=False)
+    return freq
+
+
+@lru_cache(maxsize=64)
+def window_array(name, n):
+    """按 (窗函数, 长度) 缓存的窗函数数组（只读）"""
+    if name == 'hann':
+        window = np.hanning(n)
+    elif name == 'hamming':
+        window = np.hamming(n)
+    elif name == 'blackman':
+        window = np.blackman(n)
+    else:
+        window = np.ones(n)
+    window.setflags(write=False)
+    return window
+
+
+def single_sided_amplitude(magnitude, window_sum, nfft):
+    """把 rfft 的模换算为单边幅度：除以窗函数之和，直流和奈奎斯特以外的频点乘 2。
+
+    换算后正弦分量的峰值等于其幅值，与数据长度、补零和窗函数无关。
+    """
+    amplitude = magnitude * (2.0 / window_sum)
+    amplitude[..., 0] /= 2
+    if nfft % 2 == 0:
+        amplitude[..., -1] /= 2
+    return amplitude
+
+
+def magnitude_spectrum(data, sampling_rate, window=None, pad=True):
+    """单边幅度谱：实数 FFT，可选加窗，并补零到快速长度"""
+    data = np.asarray(data, dtype=np.float64)
+    n = len(data)
+    nfft = next_fast_len(n) if pad else n
+    if window is None:
+        # 矩形窗：窗函数之和即为 n
+        magnitude = np.abs(np.fft.rfft(data, nfft))
+        return rfft_frequencies(nfft, sampling_rate), single_sided_amplitude(magnitude, n, nfft)
+    weights = window_array(window, n)
+    magnitude = np.abs(np.fft.rfft(data * weights, nfft))
+    return rfft_frequencies(nfft, sampling_rate), single_sided_amplitude(magnitude, weights.sum(), nfft)
+
+
+def welch_spectrum(data, sampling_rate, segment_length=WELCH_SEGMENT, overlap=0.5, window='hann'):
+    """Welch 平均幅度谱：分段加窗后在一次二维 rfft 中计算并取平均，幅度换算同 magnitude_spectrum"""
+    data = np.asarray(data, dtype=np.float64)
+    segment_length = min(segment_length, len(data))
+    step = max(int(segment_length * (1 - overlap)), 1)
+    segments = np.lib.stride_tricks.sliding_window_view(data, segment_length)[::step]
+    nfft = next_fast_len(segment_length)
+    weights = window_array(window, segment_length)
+    spectra = np.abs(np.fft.rfft(segments * weights, nfft, axis=1))
+    return rfft_frequencies(nfft, sampling_rate), single_sided_amplitude(spectra.mean(axis=0), weights.sum(), nfft)
+
+
+def spectrum(data, sampling_rate):
+    """频谱视图使用的默认谱估计：短数据直接 FFT，长数据 Welch 平均。
+
+    两种估计都换算为单边幅度，数据长度跨过 WELCH_THRESHOLD 时纵轴刻度不变。
+    """
+    if len(data) > WELCH_THRESHOLD:
+        return welch_spectrum(data, sampling_rate)
+    return magnitude_spectrum(data, sampling_rate)
+
+
+@lru_cache(maxsize=32)
+def band_mask(n, sampling_rate, lower_bound, upper_bound):
+    """rfft 频点上的理想滤波掩码：lower_bound 为 0 时为低通，否则为带通"""
+    freq = rfft_frequencies(n, sampling_rate)
+    if lower_bound == 0:
+        mask = freq <= upper_bound
+    else:
+        mask = (freq >= lower_bound) & (freq <= upper_bound)
+    mask.setflags(write=False)
+    return mask
+
+
+def fft_filter(data, lower_bound, upper_bound, sampling_rate):
+    """沿最后一维做理想（砖墙）频域滤波，支持一维或按行堆叠的多通道数据"""
+    data = np.asarray(data, dtype=np.float64)
+    n = data.shape[-1]
+    spectrum_data = np.fft.rfft(data, axis=-1)
+    spectrum_data *= band_mask(n, sampling_rate, lower_bound, upper_bound)
+    return np.fft.irfft(spectrum_data, n, axis=-1)
+
+
+def batch_fft_filter(channels, lower_bound, upper_bound, sampling_rates):
+    """对多个通道一次性做理想滤波。
+
+    长度和采样率相同的通道堆叠成二维数组，在一次向量化 rfft/irfft 中完成，
+    返回与输入顺序一致的结果列表。
+    """
+    results = [None] * len(channels)
+    groups = {}
+    for i, (channel, rate) in enumerate(zip(channels, sampling_rates)):
+        groups.setdefault((len(channel), rate), []).append(i)
+    for (length, rate), indices in groups.items():
+        stacked = np.vstack([np.asarray(channels[i], dtype=np.float64) for i in indices])
+        filtered = fft_filter(stacked, lower_bound, upper_bound, rate)
+        for row, i in enumerate(indices):
+            results[i] = filtered[row]
+    return results
+
+
+def stft_segment_length(sampling_rate):
+    """按采样率选取 STFT 帧长：约半秒的 2 的幂，限制在 [32, 1024]"""
+    target = max(sampling_rate / 2, 1)
+    return int(min(max(1 << int(round(np.log2(target))), 32), 1024))
+
+
+class StreamingSTFT:
+    """增量短时傅里叶变换。
+
+    push() 只变换新凑满的帧，不足一帧的尾部样本留到下一次；结果以 dB 写入
+    一个固定列数的滚动图像，存储方式与 RingBuffer 相同（镜像写入），
+    image() 总能零拷贝返回按时间排序的连续视图。
+    """
+    FLOOR_DB = -120.0
+
+    def __init__(self, sampling_rate, history_seconds, segment_length=None, window='hann'):
+        self.sampling_rate = sampling_rate
+        self.segment_length = segment_length or stft_segment_length(sampling_rate)
+        self.hop = self.segment_length // 2
+        self.window = window
+        self.n_bins = self.segment_length // 2 + 1
+        self.history = max(int(np.ceil(history_seconds * sampling_rate / self.hop)), 1)
+        self.columns = np.full((2 * self.history, self.n_bins), self.FLOOR_DB)
+        self.head = 0
+        self.pending = np.empty(0)
+
+    def push(self, samples):
+        """追加新样本，返回新完成的帧数"""
+        data = np.concatenate((self.pending, np.asarray(samples, dtype=np.float64)))
+        if len(data) < self.segment_length:
+            self.pending = data
+            return 0
+        count = 1 + (len(data) - self.segment_length) // self.hop
+        frames = np.lib.stride_tricks.sliding_window_view(data, self.segment_length)[::self.hop][:count]
+        magnitude = np.abs(np.fft.rfft(frames * window_array(self.window, self.segment_length), axis=1))
+        self.write(20 * np.log10(magnitude + 1e-12))
+        self.pending = data[count * self.hop:]
+        return count
+
+    def write(self, columns):
+        if len(columns) > self.history:
+            columns = columns[-self.history:]
+        positions = (self.head + np.arange(len(columns))) % self.history
+        self.columns[positions] = columns
+        self.columns[positions + self.history] = columns
+        self.head = (self.head + len(columns)) % self.history
+
+    def image(self):
+        """形状为 (频点数, 时间列数) 的图像视图，最新一列在最右侧"""
+        return self.columns[self.head:self.head + self.history].T
+
+    def extent(self):
+        """imshow 的 extent：横轴为相对最新样本的时间，纵轴为频率"""
+        return (-self.history * self.hop / self.sampling_rate, 0.0, 0.0, self.sampling_rate / 2)
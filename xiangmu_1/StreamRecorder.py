@@ -0,0 +1,273 @@
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# 文件格式：
+#   文件头  MAGIC | uint32 头信息长度 | JSON 头信息（通道数、采样率、压缩方式等）
+#   数据块  CHUNK_TAG | uint32 帧数 | uint32 负载字节数 | float64 首/末时间戳 | 负载
+#   负载为 float64 时间戳[n] 紧接 float64 数据[n, channels]（行优先），可选 zlib 压缩
+MAGIC = b'AIREC001'
+HEADER_LENGTH = struct.Struct('<I')
+CHUNK_TAG = b'CHNK'
+CHUNK_HEADER = struct.Struct('<4sIIdd')
+RECORDING_SUFFIX = '.airec'
+
+DEFAULT_CHUNK_FRAMES = 4096
+DEFAULT_MAX_PENDING_CHUNKS = 64
+
+
+class StreamRecorder:
+    """把采集到的每一帧持续写入磁盘的后台写线程。
+
+    write() 在采集线程中调用，只做内存追加和非阻塞入队；压缩和磁盘写入都在
+    独立的写线程中完成。写入队列有上限，磁盘卡顿导致队列满时丢弃整块数据并
+    计入 dropped_frames，而不会阻塞采样循环。
+    """
+
+    def __init__(self, path, channels, sampling_rate, compress=False,
+                 chunk_frames=DEFAULT_CHUNK_FRAMES, max_pending_chunks=DEFAULT_MAX_PENDING_CHUNKS):
+        self.path = path
+        self.channels = channels
+        self.sampling_rate = sampling_rate
+        self.compress = compress
+        self.chunk_frames = chunk_frames
+        self.queue = queue.Queue(maxsize=max_pending_chunks)
+
+        self.pending_timestamps = []
+        self.pending_frames = []
+        self.pending_count = 0
+
+        self.frames_written = 0
+        self.dropped_frames = 0
+        self.error = None
+        self.thread = None
+
+    def start(self):
+        self.file = open(self.path, 'wb')
+        header = json.dumps({
+            'channels': self.channels,
+            'sampling_rate': self.sampling_rate,
+            'compression': 'zlib' if self.compress else 'none',
+            'dtype': 'float64',
+            'start_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }).encode('utf-8')
+        self.file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def write(self, timestamps, frames):
+        """追加一批帧（采集线程调用，不阻塞）"""
+        self.pending_timestamps.append(timestamps)
+        self.pending_frames.append(frames)
+        self.pending_count += len(timestamps)
+        if self.pending_count >= self.chunk_frames:
+            self.flush_pending()
+
+    def flush_pending(self, block=False):
+        if self.pending_count == 0:
+            return
+        chunk = (np.concatenate(self.pending_timestamps), np.concatenate(self.pending_frames))
+        if block:
+            self.queue.put(chunk)
+        else:
+            try:
+                self.queue.put_nowait(chunk)
+            except queue.Full:
+                self.dropped_frames += self.pending_count
+        self.pending_timestamps = []
+        self.pending_frames = []
+        self.pending_count = 0
+
+    def stop(self):
+        """写出剩余数据并等待写线程结束"""
+        # 最后一块不因队列暂时满而丢弃，等写线程腾出位置
+        self.flush_pending(block=True)
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        try:
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                timestamps, frames = chunk
+                payload = (np.ascontiguousarray(timestamps, dtype=np.float64).tobytes()
+                           + np.ascontiguousarray(frames, dtype=np.float64).tobytes())
+                if self.compress:
+                    payload = zlib.compress(payload, 1)
+                self.file.write(CHUNK_HEADER.pack(CHUNK_TAG, len(timestamps), len(payload),
+                                                  timestamps[0], timestamps[-1]))
+                self.file.write(payload)
+                self.frames_written += len(timestamps)
+        except OSError as e:
+            self.error = e
+            # 写入失败后继续取走队列数据直到收到结束标记，避免 stop() 因队列满而阻塞
+            while self.queue.get() is not None:
+                pass
+        finally:
+            self.file.close()
+
+
+class RecordingReader:
+    """StreamRecorder 录制文件的惰性读取器。
+
+    打开时只扫描各数据块的块头建立索引（帧数、偏移、首末时间戳），
+    数据通过 mmap 按需读取：未压缩的块直接零拷贝映射，压缩块解压后
+    放入一个小的 LRU 缓存，便于来回平移时复用。
+    """
+    CACHED_CHUNKS = 8
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mm = None
+        self.chunk_cache = OrderedDict()
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.mm[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a recording file")
+            (header_length,) = HEADER_LENGTH.unpack_from(self.mm, len(MAGIC))
+            header_start = len(MAGIC) + HEADER_LENGTH.size
+            self.header = json.loads(self.mm[header_start:header_start + header_length].decode('utf-8'))
+            self.channels = self.header['channels']
+            self.sampling_rate = self.header['sampling_rate']
+            self.compressed = self.header['compression'] == 'zlib'
+            self.build_index(header_start + header_length)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """释放映射和文件句柄（Windows 上映射存在期间文件不能被重新录制覆盖）"""
+        self.chunk_cache.clear()
+        if self.mm is not None:
+            try:
+                self.mm.close()
+            except BufferError:
+                # 仍有零拷贝读取的数组引用映射：交给垃圾回收在其释放后关闭
+                pass
+            self.mm = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def build_index(self, offset):
+        offsets, counts, lengths, firsts, lasts = [], [], [], [], []
+        while offset + CHUNK_HEADER.size <= len(self.mm):
+            tag, count, length, first, last = CHUNK_HEADER.unpack_from(self.mm, offset)
+            offset += CHUNK_HEADER.size
+            if tag != CHUNK_TAG or offset + length > len(self.mm):
+                break  # 录制被中断时最后一块可能不完整
+            offsets.append(offset)
+            counts.append(count)
+            lengths.append(length)
+            firsts.append(first)
+            lasts.append(last)
+            offset += length
+        self.chunk_offsets = np.array(offsets, dtype=np.int64)
+        self.chunk_counts = np.array(counts, dtype=np.int64)
+        self.chunk_lengths = np.array(lengths, dtype=np.int64)
+        self.chunk_first = np.array(firsts, dtype=np.float64)
+        self.chunk_last = np.array(lasts, dtype=np.float64)
+
+    def __len__(self):
+        return int(self.chunk_counts.sum())
+
+    @property
+    def start_time(self):
+        return float(self.chunk_first[0]) if len(self.chunk_first) > 0 else 0.0
+
+    @property
+    def end_time(self):
+        return float(self.chunk_last[-1]) if len(self.chunk_last) > 0 else 0.0
+
+    def read_chunk(self, k, cache=True):
+        """返回第 k 块的 (时间戳[n], 数据[n, channels])"""
+        if cache and k in self.chunk_cache:
+            self.chunk_cache.move_to_end(k)
+            return self.chunk_cache[k]
+        count = int(self.chunk_counts[k])
+        offset = int(self.chunk_offsets[k])
+        values = count * (self.channels + 1)
+        if self.compressed:
+            payload = zlib.decompress(self.mm[offset:offset + int(self.chunk_lengths[k])])
+            data = np.frombuffer(payload, dtype=np.float64, count=values)
+        else:
+            data = np.frombuffer(self.mm, dtype=np.float64, count=values, offset=offset)
+        chunk = (data[:count], data[count:].reshape(count, self.channels))
+        if cache and self.compressed:
+            self.chunk_cache[k] = chunk
+            if len(self.chunk_cache) > self.CACHED_CHUNKS:
+                self.chunk_cache.popitem(last=False)
+        return chunk
+
+    def window(self, channel, t_start, t_end):
+        """读取指定通道在 [t_start, t_end] 内的 (时间戳, 数据)，只解码相关数据块"""
+        first = int(np.searchsorted(self.chunk_last, t_start, side='left'))
+        last = int(np.searchsorted(self.chunk_first, t_end, side='right'))
+        times = []
+        values = []
+        for k in range(first, last):
+            timestamps, frames = self.read_chunk(k)
+            times.append(timestamps)
+            values.append(frames[:, channel])
+        if not times:
+            return np.empty(0), np.empty(0)
+        times = np.concatenate(times)
+        values = np.concatenate(values)
+        start = np.searchsorted(times, t_start, side='left')
+        stop = np.searchsorted(times, t_end, side='right')
+        return times[start:stop], values[start:stop]
+
+    def channel(self, channel):
+        return RecordingChannel(self, channel)
+
+    def iter_chunks(self, channel):
+        # 顺序遍历不经过 LRU 缓存，可在后台线程中与 window() 并发使用
+        for k in range(len(self.chunk_offsets)):
+            timestamps, frames = self.read_chunk(k, cache=False)
+            yield timestamps, frames[:, channel]
+
+
+class RecordingChannel:
+    """录制文件中单个通道的视图，接口与 DataLoader.ArraySeries 一致"""
+
+    def __init__(self, reader, channel):
+        self.reader = reader
+        self.channel = channel
+        self.sampling_rate = reader.sampling_rate
+        self.path = reader.path
+
+    def __len__(self):
+        return len(self.reader)
+
+    @property
+    def start_time(self):
+        return self.reader.start_time
+
+    @property
+    def end_time(self):
+        return self.reader.end_time
+
+    def window(self, t_start, t_end):
+        return self.reader.window(self.channel, t_start, t_end)
+
+    def iter_chunks(self):
+        return self.reader.iter_chunks(self.channel)
+
+    def close(self):
+        self.reader.close()
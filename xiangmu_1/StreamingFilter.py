@@ -0,0 +1,72 @@
+import numpy as np
+
+DEFAULT_IIR_ORDER = 4
+DEFAULT_FIR_TAPS = 101
+
+
+def scipy_signal():
+    """按需导入 scipy.signal，未安装 scipy 时给出明确的错误信息"""
+    try:
+        from scipy import signal
+    except ImportError as e:
+        raise ImportError("Live filtering requires scipy; install it with 'pip install scipy'.") from e
+    return signal
+
+
+class StreamingFilter:
+    """跨数据块保持状态的流式滤波器。
+
+    IIR 以二阶节（SOS）形式实现，FIR 以抽头系数实现，滤波器状态在相邻数据块
+    之间保留，每块只处理新到的样本，开销与新样本数成正比，结果与一次性
+    处理整段数据相同。
+
+    scipy.signal 导入较慢，在各方法中经 scipy_signal() 按需导入，导入本模块
+    不依赖 scipy；未安装 scipy 时在创建或使用滤波器时抛出 ImportError。
+    """
+
+    def __init__(self, sos=None, taps=None):
+        self.sos = sos
+        self.taps = taps
+        self.zi = None
+
+    @classmethod
+    def iir(cls, lower_bound, upper_bound, sampling_rate, order=DEFAULT_IIR_ORDER):
+        """Butterworth 滤波器：lower_bound 为 0 时为低通，否则为带通"""
+        signal = scipy_signal()
+        if lower_bound <= 0:
+            sos = signal.butter(order, upper_bound, btype='lowpass', fs=sampling_rate, output='sos')
+        else:
+            sos = signal.butter(order, [lower_bound, upper_bound], btype='bandpass', fs=sampling_rate,
+                                output='sos')
+        return cls(sos=sos)
+
+    @classmethod
+    def fir(cls, lower_bound, upper_bound, sampling_rate, numtaps=DEFAULT_FIR_TAPS):
+        """窗函数法设计的线性相位 FIR 滤波器：lower_bound 为 0 时为低通，否则为带通"""
+        signal = scipy_signal()
+        if lower_bound <= 0:
+            taps = signal.firwin(numtaps, upper_bound, fs=sampling_rate)
+        else:
+            taps = signal.firwin(numtaps, [lower_bound, upper_bound], pass_zero=False, fs=sampling_rate)
+        return cls(taps=taps)
+
+    def reset(self, initial_value=0.0):
+        """按稳态初始化滤波器状态，避免起始阶跃引起的暂态"""
+        signal = scipy_signal()
+        if self.sos is not None:
+            self.zi = signal.sosfilt_zi(self.sos) * initial_value
+        else:
+            self.zi = signal.lfilter_zi(self.taps, 1.0) * initial_value
+
+    def process(self, block):
+        signal = scipy_signal()
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) == 0:
+            return block
+        if self.zi is None:
+            self.reset(block[0])
+        if self.sos is not None:
+            filtered, self.zi = signal.sosfilt(self.sos, block, zi=self.zi)
+        else:
+            filtered, self.zi = signal.lfilter(self.taps, 1.0, block, zi=self.zi)
+        return filtered
@@ -0,0 +1,185 @@
+import numpy as np
+
+from common.ResultCache import ResultCache
+
+# 相位累加器为整数，PHASE_ONE 对应一个完整周期，高位部分即已完成的周期数
+PHASE_BITS = 32
+PHASE_ONE = 1 << PHASE_BITS
+PHASE_MASK = PHASE_ONE - 1
+# 波表长度（2 的幂），相位的高 TABLE_BITS 位为表索引，其余位为插值系数
+TABLE_BITS = 12
+TABLE_SIZE = 1 << TABLE_BITS
+FRACTION_BITS = PHASE_BITS - TABLE_BITS
+
+WAVE_SHAPES = ('sine', 'ramp', 'constant', 'square')
+# 方波在表内插值会把跳变沿抹成斜坡，只对连续波形插值；方波的跳变沿
+# 不查表，直接按周期内样本序号判断（见 DDSEngine.square_edge）
+INTERPOLATED_SHAPES = ('sine', 'ramp')
+
+# 整数周期的精确波表按 (波形, 偏置, 幅值, 周期) 缓存，总内存不超过上限
+WAVETABLE_CACHE_BYTES = 64 * 1024 * 1024
+# 超过该周期（样本数）的波形不生成精确波表，改用插值合成
+MAX_TABLE_PERIOD = 1_000_000
+
+_unit_tables = {}
+wavetable_cache = ResultCache(WAVETABLE_CACHE_BYTES)
+
+
+def build_waveform_table(shape, offset, amplitude, period):
+    """用向量运算生成一个周期（period 个样本）的波形"""
+    i = np.arange(period, dtype=np.float64)
+    if shape == 'sine':
+        table = offset + amplitude * np.sin(2 * np.pi * i / period)
+    elif shape == 'ramp':
+        table = offset + amplitude * (i / period)
+    elif shape == 'constant':
+        table = np.full(period, float(offset))
+    elif shape == 'square':
+        table = np.where(i < period // 2, offset + amplitude, offset - amplitude)
+    else:
+        raise ValueError(f"Unknown waveform shape: {shape}")
+    table.flags.writeable = False
+    return table
+
+
+def waveform_table(shape, offset, amplitude, period):
+    """一个周期的精确波表，相同参数再次请求时直接取缓存"""
+    return wavetable_cache.get_or_compute(
+        (shape, float(offset), float(amplitude), int(period)),
+        lambda: build_waveform_table(shape, float(offset), float(amplitude), int(period)))
+
+
+def unit_wavetable(shape):
+    """一个周期的归一化波表，共 TABLE_SIZE + 1 点。
+
+    最后一点是周期终点处的左极限（斜坡为 1 而不是回到 0），插值时
+    最后一个区间不会跨过周期边界的跳变。各波形的表只生成一次。
+    """
+    table = _unit_tables.get(shape)
+    if table is None:
+        phase = np.arange(TABLE_SIZE + 1, dtype=np.float64) / TABLE_SIZE
+        if shape == 'sine':
+            table = np.sin(2 * np.pi * phase)
+        elif shape == 'ramp':
+            table = phase
+        elif shape == 'constant':
+            table = np.zeros_like(phase)
+        elif shape == 'square':
+            table = np.where(phase < 0.5, 1.0, -1.0)
+        else:
+            raise ValueError(f"Unknown waveform shape: {shape}")
+        table.flags.writeable = False
+        _unit_tables[shape] = table
+    return table
+
+
+class DDSEngine:
+    """直接数字合成（DDS）波形发生器。
+
+    每个输出样本把相位累加器加上频率控制字 tuning_word = PHASE_ONE / period，
+    再用相位查归一化波表并线性插值，输出 offset + amplitude * 表值。
+    period 为每个周期的样本数，可以是小数；周期、幅值、偏置和波形都可以
+    随时修改，从下一个样本起生效，不需要重建任何数据。
+
+    period 为整数时改为直接循环读取 waveform_table() 的精确波表，输出与
+    逐点公式完全一致，也省去插值和缩放；波表由缓存共享，切换回用过的
+    波形和参数不需要重新计算。
+    """
+
+    def __init__(self, shape='sine', offset=0.0, amplitude=1.0, period=100):
+        self.phase = 0  # 当前周期内的相位，范围 [0, PHASE_ONE)
+        self.cycles = 0  # 已完成的周期数
+        self.shape = shape
+        self.set_params(offset, amplitude, period)
+        self.set_shape(shape)
+
+    def set_shape(self, shape):
+        self.table = unit_wavetable(shape)
+        self.interpolate = shape in INTERPOLATED_SHAPES
+        self.shape = shape
+        self.update_exact_table()
+
+    def set_params(self, offset=None, amplitude=None, period=None):
+        if offset is not None:
+            self.offset = float(offset)
+        if amplitude is not None:
+            self.amplitude = float(amplitude)
+        if period is not None:
+            if period <= 0:
+                raise ValueError("Period must be positive.")
+            self.period = float(period)
+            self.tuning_word = max(1, round(PHASE_ONE / self.period))
+            self.square_edge = self.compute_square_edge()
+        self.update_exact_table()
+
+    def compute_square_edge(self):
+        """方波由高变低处的相位。
+
+        与逐点公式一致：周期内样本序号 i < period // 2 时为高，奇数周期低电平
+        多一个样本。比较前相位先加半个样本（见 next_chunk），频率控制字的
+        舍入误差不会让周期起点附近的样本落到跳变沿的另一侧。
+        """
+        return round((self.period // 2) * PHASE_ONE / self.period)
+
+    def update_exact_table(self):
+        if self.period.is_integer() and self.period <= MAX_TABLE_PERIOD:
+            self.exact_table = waveform_table(self.shape, self.offset, self.amplitude, self.period)
+        else:
+            self.exact_table = None
+
+    def reset(self):
+        self.phase = 0
+        self.cycles = 0
+
+    def sample_index(self, period):
+        """精确波表路径下当前周期内的样本序号（可能等于 period，即周期刚好结束）"""
+        return round(self.phase * period / PHASE_ONE)
+
+    def samples_until(self, total_cycles):
+        """输出到第 total_cycles 个周期结束还需要的样本数"""
+        if total_cycles == float('inf'):
+            return total_cycles
+        exact_table = self.exact_table
+        if exact_table is not None:
+            # 精确波表按整样本前进，按样本数计算，不受频率控制字舍入的影响；
+            # 与相位累加路径一样向上取整，不足一个样本的尾部也输出一个样本
+            period = len(exact_table)
+            return max(int(np.ceil(total_cycles * period)) - (self.cycles * period + self.sample_index(period)), 0)
+        left = round(total_cycles * PHASE_ONE) - (self.cycles * PHASE_ONE + self.phase)
+        return max(-(-left // self.tuning_word), 0)
+
+    def next_chunk(self, count):
+        """合成接下来的 count 个样本"""
+        exact_table = self.exact_table
+        if exact_table is not None:
+            return self.next_exact_chunk(exact_table, count)
+        # 参数可能被界面线程修改，整块使用同一组取值
+        tuning_word, offset, amplitude = self.tuning_word, self.offset, self.amplitude
+        table, interpolate, shape = self.table, self.interpolate, self.shape
+        phases = (self.phase + tuning_word * np.arange(count, dtype=np.int64)) & PHASE_MASK
+        if shape == 'square':
+            centered = (phases + tuning_word // 2) & PHASE_MASK
+            values = np.where(centered < self.square_edge, 1.0, -1.0)
+        else:
+            index = phases >> FRACTION_BITS
+            values = table[index]
+        if interpolate:
+            fraction = (phases & ((1 << FRACTION_BITS) - 1)) / (1 << FRACTION_BITS)
+            values = values + fraction * (table[index + 1] - values)
+        end = self.phase + tuning_word * count
+        self.cycles += end >> PHASE_BITS
+        self.phase = end & PHASE_MASK
+        return offset + amplitude * values
+
+    def next_exact_chunk(self, table, count):
+        period = len(table)
+        start = self.sample_index(period)
+        if start >= period:
+            # 从相位累加路径切换过来时相位可能恰好停在周期末尾
+            self.cycles += 1
+            start -= period
+        values = table[(start + np.arange(count)) % period]
+        end = start + count
+        self.cycles += end // period
+        self.phase = (end % period) * PHASE_ONE // period
+        return values
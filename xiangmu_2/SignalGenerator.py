@@ -1,78 +1,398 @@
 import sys
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from PyQt5.QtWidgets import (QApplication, QWidget, QFileDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QPushButton, QLineEdit, QLabel, QSlider, QCheckBox)
-from PyQt5.QtCore import QTimer, Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
 import time
-import math
-from Automation.BDaq.InstantAoCtrl import InstantAoCtrl
-from Automation.BDaq.BDaqApi import BioFailed
+from threading import Lock
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from common.DeadlineTimer import DeadlineTimer
+from common.DisplayScheduler import get_display_scheduler
+from common.StripChart import create_strip_chart
+from xiangmu_2.DDS import DDSEngine, WAVE_SHAPES
+from xiangmu_2.WaveformStream import open_waveform_stream, WAVEFORM_FILE_FILTER
+
+# 绘图中显示的最近输出样本数
+PLOT_POINTS = 100
+# 逐点输出（软件定时）和缓冲输出（设备时钟）各自允许的最高输出速率
+MAX_TIMED_OUTPUT_RATE = 1000
+MAX_BUFFERED_OUTPUT_RATE = 10000
+# 逐点输出时预览发回界面的间隔，约为显示帧率
+PREVIEW_INTERVAL_NS = 33_000_000
+# 缓冲输出每次向设备补充的数据时长（秒），启动前预先填入 PREFILL_CHUNKS 块
+BUFFER_CHUNK_SECONDS = 0.1
+PREFILL_CHUNKS = 2
+
+
+def bio_failed(ret):
+    # 设备驱动按需导入，导入本模块不会加载驱动
+    from Automation.BDaq.BDaqApi import BioFailed
+    return BioFailed(ret)
 
 
 class SignalGenerator:
+    """AO 信号源。标准波形（正弦、斜坡、常数、方波）由 DDSEngine 实时合成，
+    自定义波形（signal_array）逐点循环输出，波形文件（signal_stream）由
+    WaveformStream 从磁盘边读边输出。波形和参数可在输出过程中修改，
+    从下一个样本起生效；同一个实例在波形切换之间保留已打开的 AO 设备。
+    """
+
     def __init__(self, device_description="USB-4704,BID#0", profile_path="../../profile/DemoDevice.xml",
-                 signal_array=None, signal_type='custom', offset=1.0, amplitude=1.0, period=100):
-        self.instantAo = InstantAoCtrl(device_description)
-        self.instantAo.loadProfile = profile_path
+                 signal_array=None, signal_type='custom', offset=1.0, amplitude=1.0, period=100,
+                 signal_stream=None):
+        self.device_description = device_description
+        self.profile_path = profile_path
+        self.ao_ctrl = None
         self.offset = offset
         self.amplitude = amplitude
         self.period = period
         self.index = 0
         self.cycle_count = 0  # 已输出的周期数
         self.total_cycles = float('inf')  # 默认无限循环
-
-        if signal_array is not None:
-            self.signal_array = signal_array
+        self.dds = None
+        self.signal_array = None
+        self.stream = None
+
+        if signal_stream is not None:
+            self.set_signal_stream(signal_stream)
+        elif signal_array is not None:
+            self.set_signal_array(signal_array)
         else:
-            if signal_type == 'sine':
-                self.signal_array = [offset + amplitude * math.sin(2 * math.pi * i / period) for i in range(period)]
-            elif signal_type == 'ramp':
-                self.signal_array = [offset + amplitude * (i / period) for i in range(period)]
-            elif signal_type == 'constant':
-                self.signal_array = [offset] * period
-            elif signal_type == 'square':  # 方波信号
-                self.signal_array = [offset + amplitude if i % (period // 2) == 0 else offset - amplitude for i in range(period)]
-            else:
-                raise ValueError(
-                    "Invalid signal type. Choose from 'sine', 'ramp', 'constant', 'square' or provide a custom array.")
-
-    def next_value(self):
-        """获取并返回信号数组中的下一个值，同时更新索引和周期计数。"""
-        value = self.signal_array[self.index]
-        self.index = (self.index + 1) % len(self.signal_array)
+            self.set_shape(signal_type)
+
+    def set_shape(self, signal_type):
+        """切换为标准波形，由 DDS 合成"""
+        if signal_type not in WAVE_SHAPES:
+            raise ValueError(
+                "Invalid signal type. Choose from 'sine', 'ramp', 'constant', 'square' or provide a custom array.")
+        if self.dds is None:
+            self.dds = DDSEngine(signal_type, self.offset, self.amplitude, self.period)
+        else:
+            self.dds.set_shape(signal_type)
+        self.signal_array = None
+        self.close_stream()
 
-        if self.index == 0:
-            self.cycle_count += 1  # 每个完整周期结束后计数加1
+    def set_signal_array(self, signal_array):
+        """切换为自定义波形，按数组逐点循环输出"""
+        self.signal_array = np.asarray(signal_array, dtype=np.float64)
+        self.index = 0
+        self.dds = None
+        self.close_stream()
+
+    def set_signal_stream(self, stream):
+        """切换为从磁盘流式读取的波形文件"""
+        previous = self.stream
+        self.stream = stream
+        self.dds = None
+        self.signal_array = None
+        if previous is not None:
+            previous.close()
+
+    def close_stream(self):
+        # 先切换到新的信号源再关闭，输出线程不会读到空的信号源
+        stream = self.stream
+        self.stream = None
+        if stream is not None:
+            stream.close()
+
+    def set_params(self, offset=None, amplitude=None, period=None):
+        """修改标准波形的偏置、幅值和周期（样本数，可为小数）"""
+        if self.dds is not None:
+            self.dds.set_params(offset, amplitude, period)
+        if offset is not None:
+            self.offset = offset
+        if amplitude is not None:
+            self.amplitude = amplitude
+        if period is not None:
+            self.period = period
+
+    @property
+    def instantAo(self):
+        """AO 设备在第一次输出时才打开，选择波形不会访问硬件"""
+        if self.ao_ctrl is None:
+            from Automation.BDaq.InstantAoCtrl import InstantAoCtrl
+            self.ao_ctrl = InstantAoCtrl(self.device_description)
+            self.ao_ctrl.loadProfile = self.profile_path
+        return self.ao_ctrl
 
-        return value
+    def next_value(self):
+        """获取并返回下一个值，同时更新周期计数；已达到 total_cycles 时返回 None。"""
+        chunk = self.next_chunk(1)
+        return chunk[0] if len(chunk) > 0 else None
+
+    def next_chunk(self, count):
+        """按顺序取出最多 count 个样本（跨周期循环），达到 total_cycles 时截断。"""
+        # 波形可能在输出线程取样本的同时被界面线程切换，先取出当前的信号源
+        dds = self.dds
+        if dds is not None:
+            count = int(min(count, dds.samples_until(self.total_cycles)))
+            chunk = dds.next_chunk(count)
+            self.cycle_count = dds.cycles
+            return chunk
+        stream = self.stream
+        if stream is not None:
+            chunk = stream.next_chunk(count, self.total_cycles)
+            if len(chunk) == 0 and self.stream is not stream:
+                # 读取时波形被切换，旧的数据流已关闭
+                return self.next_chunk(count)
+            self.cycle_count = stream.cycle_count
+            return chunk
+        signal = self.signal_array
+        length = len(signal)
+        # 与 DDS 和 WaveformStream 相同，不足一个样本的尾部向上取整
+        remaining = np.ceil(self.total_cycles * length) - (self.cycle_count * length + self.index)
+        count = int(min(count, max(remaining, 0)))
+        chunk = signal[(self.index + np.arange(count)) % length]
+        advanced = self.index + count
+        self.cycle_count += advanced // length
+        self.index = advanced % length
+        return chunk
 
     def reset_cycle_count(self):
         """重置已输出的周期计数和信号索引。"""
         self.cycle_count = 0
         self.index = 0
+        if self.dds is not None:
+            self.dds.reset()
+        if self.stream is not None:
+            self.stream.rewind()
+
+
+class OutputThread(QThread):
+    """AO 输出线程的公共部分：速率、暂停、停止和抽取预览。
+
+    界面线程只通过 set_rate / set_paused / stop 控制输出，输出的样本
+    抽取后经 preview_ready 发回界面绘制。
+    """
+    # (首个样本序号, 抽取步长, 抽取后的样本)
+    preview_ready = pyqtSignal(int, int, object)
+    output_finished = pyqtSignal()
+    output_failed = pyqtSignal(str)
+
+    def __init__(self, signal_gen, rate):
+        super().__init__()
+        self.signal_gen = signal_gen
+        self.rate = rate
+        self.running = True
+        self.paused = False
+        self.restart = False
+        self.samples_written = 0
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.restart = True
+
+    def set_paused(self, paused):
+        self.paused = paused
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+    def emit_preview(self, values):
+        """发出从 samples_written 开始的一段已输出样本的抽取预览"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        step = max(1, len(values) // PLOT_POINTS)
+        self.preview_ready.emit(self.samples_written, step, values[::step])
+        self.samples_written += len(values)
+
+
+class TimedOutputThread(OutputThread):
+    """软件定时的逐点 AO 输出线程。
+
+    每个样本按 DeadlineTimer 的绝对截止时间用 InstantAoCtrl.writeAny 写出，
+    周期为浮点纳秒，30 Hz、70 Hz 等非整数毫秒周期的速率也是准确的；
+    输出节奏不受界面线程绘图的影响。错过的周期对应的样本直接跳过，
+    保持波形相位与时钟一致。唤醒抖动和跳过的周期数由 timing_stats() 给出。
+    """
+
+    def __init__(self, signal_gen, rate):
+        super().__init__(signal_gen, rate)
+        self.deadline = DeadlineTimer(rate)
+
+    def timing_stats(self):
+        """返回 (均方根抖动 us, 最大延迟 us, 跳过的周期数)"""
+        return (self.deadline.rms_lateness_ns() / 1000, self.deadline.max_lateness_ns / 1000,
+                self.deadline.missed)
+
+    def stop(self):
+        # 低速率时 wait() 可能要睡一整个周期，先唤醒再等待线程结束
+        self.running = False
+        self.deadline.interrupt()
+        self.wait()
+
+    def run(self):
+        try:
+            ctrl = self.signal_gen.instantAo
+        except Exception as e:
+            self.output_failed.emit(str(e))
+            return
+        self.pending = []
+        try:
+            self.output_loop(ctrl)
+        except Exception as e:
+            # 波形文件读取失败或驱动异常：交给界面结束输出
+            self.output_failed.emit(str(e))
+        self.emit_preview(self.pending)
+
+    def output_loop(self, ctrl):
+        last_preview_ns = time.perf_counter_ns()
+        self.deadline.set_rate(self.rate)
+        while self.running:
+            if self.paused:
+                self.msleep(50)
+                self.restart = True  # 恢复输出时重新对齐截止时间
+                continue
+            if self.restart:
+                self.deadline.set_rate(self.rate)
+                self.restart = False
+            missed = self.deadline.missed
+            self.deadline.wait()
+            if not self.running:
+                break
+            if self.deadline.missed > missed:
+                self.emit_preview(self.pending)
+                self.pending = []
+                skipped = self.deadline.missed - missed
+                self.samples_written += len(self.signal_gen.next_chunk(skipped))
+            chunk = self.signal_gen.next_chunk(1)
+            if len(chunk) == 0:
+                # 周期数已输出完
+                self.running = False
+                self.output_finished.emit()
+                break
+            ret = ctrl.writeAny(0, 1, None, [float(chunk[0])])
+            if bio_failed(ret):
+                raise IOError("Failed to write data.")
+            self.pending.append(chunk[0])
+
+            now_ns = time.perf_counter_ns()
+            if now_ns - last_preview_ns >= PREVIEW_INTERVAL_NS:
+                self.emit_preview(self.pending)
+                self.pending = []
+                last_preview_ns = now_ns
+
+
+class BufferedOutputThread(OutputThread):
+    """硬件定时的缓冲 AO 输出线程。
+
+    按输出速率设置 BufferedAoCtrl 的转换时钟，以流式模式启动后，由本线程
+    持续把 signal_gen 的后续样本按块（BUFFER_CHUNK_SECONDS）写入设备缓冲区；
+    setData 在设备缓冲区没有空间时阻塞，输出节奏完全由设备时钟决定，
+    与界面线程的负载无关。每块抽取后的预览通过 preview_ready 发回界面。
+    设备不支持缓冲输出时发出 output_failed，由界面退回逐点输出。
+    转换时钟只能在停止时修改，set_rate 后由输出循环重新配置设备。
+    暂停和修改速率时先等设备缓冲区中已写入的样本输出完再停止设备，
+    不丢弃已生成的样本；stop() 在界面线程直接停止设备，使阻塞中的
+    setData 立即返回。
+    """
+
+    def __init__(self, signal_gen, rate):
+        super().__init__(signal_gen, rate)
+        self.ctrl = None
+        self.ctrl_lock = Lock()
+        self.buffer_seconds = 0.0
+
+    def chunk_samples(self):
+        return max(PLOT_POINTS, int(self.rate * BUFFER_CHUNK_SECONDS))
+
+    def write_chunk(self, ctrl, count):
+        chunk = self.signal_gen.next_chunk(count)
+        if len(chunk) == 0:
+            return chunk
+        ret = ctrl.setData(len(chunk), chunk.tolist())
+        if bio_failed(ret):
+            raise IOError("Failed to write buffered AO data.")
+        self.emit_preview(chunk)
+        return chunk
+
+    def start_device(self, ctrl):
+        count = self.chunk_samples()
+        ctrl.scanChannel.channelStart = 0
+        ctrl.scanChannel.channelCount = 1
+        ctrl.scanChannel.samples = count * (PREFILL_CHUNKS + 1)
+        ctrl.convertClock.rate = self.rate
+        ctrl.streaming = True
+        self.buffer_seconds = ctrl.scanChannel.samples / self.rate
+        if bio_failed(ctrl.prepare()):
+            raise IOError("Buffered AO output is not supported by the device.")
+        for _ in range(PREFILL_CHUNKS):
+            self.write_chunk(ctrl, count)
+        if bio_failed(ctrl.start()):
+            raise IOError("Failed to start buffered AO output.")
+        self.restart = False
+
+    def wait_buffer_drained(self):
+        """等设备缓冲区中已写入的样本输出完毕，stop() 后立即返回"""
+        deadline = time.perf_counter() + self.buffer_seconds
+        while self.running and time.perf_counter() < deadline:
+            self.msleep(20)
+
+    def stop(self):
+        self.running = False
+        with self.ctrl_lock:
+            if self.ctrl is not None:
+                self.ctrl.stop(1)
+        self.wait()
+
+    def run(self):
+        try:
+            from Automation.BDaq.BufferedAoCtrl import BufferedAoCtrl
+            ctrl = BufferedAoCtrl(self.signal_gen.device_description)
+            ctrl.loadProfile = self.signal_gen.profile_path
+        except Exception as e:
+            self.output_failed.emit(str(e))
+            return
+        with self.ctrl_lock:
+            self.ctrl = ctrl
+        try:
+            while self.running:
+                if self.paused:
+                    self.msleep(50)
+                    continue
+                self.start_device(ctrl)
+                while self.running and not self.paused and not self.restart:
+                    if len(self.write_chunk(ctrl, self.chunk_samples())) == 0:
+                        # 周期数已输出完：等设备缓冲区中剩余的样本输出完毕
+                        self.wait_buffer_drained()
+                        if self.running:
+                            self.running = False
+                            self.output_finished.emit()
+                # 暂停或修改速率：已写入的样本照常输出完再停止设备
+                self.wait_buffer_drained()
+                ctrl.stop(1)
+        except Exception as e:
+            # 驱动可能抛出 IOError 以外的异常，同样交给界面退回逐点输出；
+            # stop() 中断阻塞的 setData 引起的错误不算输出失败
+            if self.running:
+                self.output_failed.emit(str(e))
+        finally:
+            with self.ctrl_lock:
+                self.ctrl = None
+            ctrl.dispose()
 
 
 class SignalUI(QWidget):
-    def __init__(self):
+    def __init__(self, plot_backend=None):
         super().__init__()
         self.setWindowTitle("Signal Generator UI")
 
         # 初始化信号生成器和输出控制
         self.signal_gen = None
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_output)
+        self.output_thread = None  # 写设备的输出线程（逐点或缓冲）
         self.output_active = False  # 用于标记是否正在输出
 
         # 默认输出频率（以赫兹为单位）
         self.output_frequency = 10  # 频率为10 Hz
 
-        # 绘图相关
-        self.x_data = list(range(100))
-        self.y_data = [0] * 100
+        # 绘图相关：横轴为输出样本序号，plot_backend 为 'matplotlib' 或 'qpainter'
+        self.plot_backend = plot_backend
+        self.sample_count = 0
 
         # 初始化UI布局
         self.init_ui()
@@ -99,6 +419,9 @@ class SignalUI(QWidget):
         param_layout.addWidget(self.amplitude_input)
         param_layout.addWidget(QLabel("Period:"))
         param_layout.addWidget(self.period_input)
+        # 参数在输出过程中修改也立即生效
+        for param_input in (self.offset_input, self.amplitude_input, self.period_input):
+            param_input.editingFinished.connect(self.apply_waveform_params)
 
         main_layout.addLayout(param_layout)
 
@@ -153,6 +476,10 @@ class SignalUI(QWidget):
         cycle_control_layout.addWidget(self.cycle_check, 0, 0)
         cycle_control_layout.addWidget(QLabel("Cycle Count:"), 0, 1)
         cycle_control_layout.addWidget(self.cycle_input, 0, 2)
+        # 缓冲输出：整块数据交给设备按硬件时钟输出，不支持时自动退回逐点输出
+        self.buffered_check = QCheckBox("Buffered Output (device-timed)")
+        self.buffered_check.stateChanged.connect(self.on_buffered_check)
+        cycle_control_layout.addWidget(self.buffered_check, 1, 0)
         main_layout.addLayout(cycle_control_layout)
 
         # 控制按钮
@@ -168,48 +495,120 @@ class SignalUI(QWidget):
         control_layout.addWidget(self.pause_button)
         main_layout.addLayout(control_layout)
 
+        # 逐点输出的定时统计：唤醒抖动和跳过的周期数
+        self.timing_label = QLabel("")
+        main_layout.addWidget(self.timing_label)
+
     def init_plot(self, main_layout):
         """初始化绘图"""
-        self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setMinimumHeight(300)  # 设置画布的最小高度
-        self.canvas.setMinimumWidth(500)  # 设置画布的最小宽度
-        self.line, = self.ax.plot(self.x_data, self.y_data)
-        self.ax.set_ylim(-2, 2)
-        main_layout.addWidget(self.canvas)  # 将画布添加到主布局
+        self.chart = create_strip_chart(self.plot_backend, self, window=PLOT_POINTS - 1, ylim=(-2, 2),
+                                        xlabel='Samples')
+        self.chart.setMinimumHeight(300)  # 设置画布的最小高度
+        self.chart.setMinimumWidth(500)  # 设置画布的最小宽度
+        self.reset_plot()
+        main_layout.addWidget(self.chart)  # 将画布添加到主布局
 
     def update_frequency_from_slider(self):
         """滑条调整频率并更新输入框"""
         self.output_frequency = self.freq_slider.value()
         self.freq_input.setText(str(self.output_frequency))
-        if self.output_active:
-            self.timer.setInterval(1000 // self.output_frequency)  # 将频率转换为毫秒
+        self.apply_output_frequency()
 
     def update_frequency_from_input(self):
         """输入框调整频率并更新滑条"""
         try:
-            value = int(self.freq_input.text())
-            if 1 <= value <= 100:
-                self.output_frequency = value
-                self.freq_slider.setValue(value)
-                if self.output_active:
-                    self.timer.setInterval(1000 // self.output_frequency)  # 将频率转换为毫秒
+            # 输出线程按浮点周期调度，输入框允许非整数频率
+            value = float(self.freq_input.text())
+            if 1 <= value <= self.max_output_rate():
+                self.set_output_frequency(value)
             else:
                 self.freq_input.setText(str(self.output_frequency))
         except ValueError:
             self.freq_input.setText(str(self.output_frequency))
 
+    def set_output_frequency(self, value):
+        """直接设置输出速率并同步控件；速率可以超出滑条范围，此时滑条停在最大值"""
+        self.output_frequency = value
+        self.freq_slider.blockSignals(True)
+        self.freq_slider.setValue(round(value))
+        self.freq_slider.blockSignals(False)
+        self.freq_input.setText(str(value))
+        self.apply_output_frequency()
+
+    def max_output_rate(self):
+        return MAX_BUFFERED_OUTPUT_RATE if self.buffered_check.isChecked() else MAX_TIMED_OUTPUT_RATE
+
+    def apply_output_frequency(self):
+        if self.output_active and self.output_thread is not None:
+            self.output_thread.set_rate(self.output_frequency)
+
+    def on_buffered_check(self):
+        if self.output_frequency > self.max_output_rate():
+            self.set_output_frequency(self.max_output_rate())
+
     def reset_plot(self):
         """重置绘图数据"""
-        self.y_data = [0] * 100  # 清空y轴数据
-        self.line.set_ydata(self.y_data)
-        self.canvas.draw()
+        self.chart.set_window(PLOT_POINTS - 1)
+        self.sample_count = PLOT_POINTS
+        self.chart.set_data(np.arange(PLOT_POINTS), np.zeros(PLOT_POINTS))  # 清空y轴数据
+
+    def on_preview(self, start, step, values):
+        """输出线程发回的抽取预览，绘制由显示调度器按帧率合并完成"""
+        positions = self.preview_base + start + step * np.arange(len(values))
+        self.chart.append(positions, values)
+        if len(positions) > 0:
+            self.sample_count = int(positions[-1]) + 1
+        get_display_scheduler().mark_dirty(self)
+
+    def render_frame(self):
+        self.chart.refresh()
+        if isinstance(self.output_thread, TimedOutputThread):
+            jitter, lateness, missed = self.output_thread.timing_stats()
+            self.timing_label.setText(f"Jitter: {jitter:.0f} us RMS, max {lateness:.0f} us, "
+                                      f"skipped periods: {missed}")
+
+    def start_output_engine(self):
+        if self.buffered_check.isChecked():
+            self.output_thread = BufferedOutputThread(self.signal_gen, self.output_frequency)
+            self.chart.set_window(max(PLOT_POINTS - 1, self.output_thread.chunk_samples()))
+        else:
+            self.output_thread = TimedOutputThread(self.signal_gen, self.output_frequency)
+        self.output_thread.preview_ready.connect(self.on_preview)
+        self.output_thread.output_finished.connect(self.finish_output)
+        self.output_thread.output_failed.connect(self.on_output_failed)
+        self.preview_base = self.sample_count
+        self.timing_label.setText("")
+        self.output_thread.start()
+        self.buffered_check.setEnabled(False)
+
+    def stop_output_engine(self):
+        if self.output_thread is not None:
+            self.output_thread.stop()
+            self.output_thread = None
+        self.buffered_check.setEnabled(True)
+
+    def on_output_failed(self, message):
+        """缓冲输出不可用时退回逐点输出，逐点输出失败时停止输出"""
+        buffered = isinstance(self.output_thread, BufferedOutputThread)
+        if self.output_thread is not None:
+            self.output_thread.wait()
+            self.output_thread = None
+        if not buffered:
+            print(f"Error: {message}")
+            self.finish_output()
+            return
+        print(f"Buffered output unavailable, falling back to per-sample output: {message}")
+        self.buffered_check.setChecked(False)
+        if self.output_active:
+            self.start_output_engine()
 
-    def update_plot(self, new_value):
-        """实时更新绘图数据"""
-        self.y_data = self.y_data[1:] + [new_value]
-        self.line.set_ydata(self.y_data)
-        self.canvas.draw()
+    def finish_output(self):
+        """输出结束（达到周期数或用户停止）后恢复界面状态"""
+        self.stop_output_engine()
+        self.output_active = False
+        self.start_button.setText("Start")
+        self.pause_button.setText("Pause")
+        self.pause_button.setEnabled(False)
 
     # 其余函数保持不变
 
@@ -220,24 +619,7 @@ class SignalUI(QWidget):
                 return
             # 开始输出
             if self.signal_gen:
-                offset = float(self.offset_input.text())
-                amplitude = float(self.amplitude_input.text())
-                period = int(self.period_input.text())
-
-                # 根据之前选择的波形类型，重新生成信号
-                if isinstance(self.signal_gen, SignalGenerator):
-                    if self.sine_button.styleSheet() == "background-color: lightblue":
-                        self.signal_gen = SignalGenerator(signal_type='sine', offset=offset, amplitude=amplitude,
-                                                          period=period)
-                    elif self.ramp_button.styleSheet() == "background-color: lightblue":
-                        self.signal_gen = SignalGenerator(signal_type='ramp', offset=offset, amplitude=amplitude,
-                                                          period=period)
-                    elif self.constant_button.styleSheet() == "background-color: lightblue":
-                        self.signal_gen = SignalGenerator(signal_type='constant', offset=offset)
-                    elif self.square_button.styleSheet() == "background-color: lightblue":
-                            self.signal_gen = SignalGenerator(signal_type='square', offset=offset, amplitude=amplitude,
-                                                              period=period)
-
+                self.apply_waveform_params()
                 self.reset_plot()  # 重置绘图数据
                 self.signal_gen.reset_cycle_count()  # 重置周期计数
                 if self.cycle_check.isChecked():
@@ -245,26 +627,20 @@ class SignalUI(QWidget):
                 else:
                     self.signal_gen.total_cycles = float('inf')  # 无限循环
 
-                self.timer.start(1000 // self.output_frequency)  # 使用滑条控制的频率
                 self.output_active = True
+                self.start_output_engine()
                 self.start_button.setText("Stop")
                 self.pause_button.setEnabled(True)
         else:
             # 结束输出
-            self.timer.stop()
-            self.output_active = False
-            self.start_button.setText("Start")
-            self.pause_button.setText("Pause")
-            self.pause_button.setEnabled(False)
+            self.finish_output()
 
     def toggle_pause(self):
         """暂停或恢复信号输出"""
-        if self.timer.isActive():
-            self.timer.stop()
-            self.pause_button.setText("Continue")
-        else:
-            self.timer.start(1000 // self.output_frequency)  # 恢复时也使用频率控制
-            self.pause_button.setText("Pause")
+        if self.output_thread is not None:
+            paused = not self.output_thread.paused
+            self.output_thread.set_paused(paused)
+            self.pause_button.setText("Continue" if paused else "Pause")
 
     def on_cycle_check(self):
         """启用或禁用周期数输入框"""
@@ -276,82 +652,69 @@ class SignalUI(QWidget):
             b.setStyleSheet("")  # 清除其他按钮的样式
         button.setStyleSheet("background-color: lightblue")  # 设置当前按钮为高亮
 
+    def waveform_params(self):
+        """从输入框读取 (偏置, 幅值, 周期)，周期为每个波形周期的输出样本数，可为小数"""
+        return (float(self.offset_input.text()), float(self.amplitude_input.text()),
+                float(self.period_input.text()))
+
+    def apply_waveform_params(self):
+        """把输入框中的参数交给信号源，输出中修改时从下一个样本起生效"""
+        if self.signal_gen is None:
+            return
+        try:
+            offset, amplitude, period = self.waveform_params()
+            self.signal_gen.set_params(offset, amplitude, period)
+        except ValueError as e:
+            print(f"Invalid waveform parameters: {e}")
+
+    def select_waveform(self, button, signal_type):
+        """切换标准波形。信号源只创建一次，切换波形不会重新打开 AO 设备"""
+        self.highlight_button(button)
+        self.amplitude_input.setEnabled(True)
+        self.period_input.setEnabled(True)
+        offset, amplitude, period = self.waveform_params()
+        if self.signal_gen is None:
+            self.signal_gen = SignalGenerator(signal_type=signal_type, offset=offset, amplitude=amplitude,
+                                              period=period)
+        else:
+            self.signal_gen.set_params(offset, amplitude, period)
+            self.signal_gen.set_shape(signal_type)
+        self.waveform_selected = True
+
     def generate_sine_wave(self):
         """生成正弦波信号并高亮按钮"""
-        self.highlight_button(self.sine_button)
-        offset = float(self.offset_input.text())
-        amplitude = float(self.amplitude_input.text())
-        period = int(self.period_input.text())
-        self.signal_gen = SignalGenerator(signal_type='sine', offset=offset, amplitude=amplitude, period=period)
-        self.waveform_selected = True
+        self.select_waveform(self.sine_button, 'sine')
 
     def generate_ramp_wave(self):
         """生成斜坡信号并高亮按钮"""
-        self.highlight_button(self.ramp_button)
-        offset = float(self.offset_input.text())
-        amplitude = float(self.amplitude_input.text())
-        period = int(self.period_input.text())
-        self.signal_gen = SignalGenerator(signal_type='ramp', offset=offset, amplitude=amplitude, period=period)
-        self.waveform_selected = True
+        self.select_waveform(self.ramp_button, 'ramp')
 
     def generate_constant_signal(self):
         """生成常数信号并高亮按钮"""
-        self.highlight_button(self.constant_button)
-        offset = float(self.offset_input.text())
-        self.signal_gen = SignalGenerator(signal_type='constant', offset=offset)
+        self.select_waveform(self.constant_button, 'constant')
         self.amplitude_input.setEnabled(False)
         self.period_input.setEnabled(False)
-        self.waveform_selected = True
 
     def generate_square_wave(self):
         """生成方波信号并高亮按钮"""
-        self.highlight_button(self.square_button)
-        offset = float(self.offset_input.text())
-        amplitude = float(self.amplitude_input.text())
-        period = int(self.period_input.text())
-
-        # 修正：生成一个完整的方波周期
-        self.signal_gen = SignalGenerator(signal_type='square', offset=offset, amplitude=amplitude, period=period)
-
-        # 修改方波生成逻辑
-        self.signal_gen.signal_array = [
-            offset + amplitude if i < period // 2 else offset - amplitude
-            for i in range(period)
-        ]
-
-        self.waveform_selected = True
+        self.select_waveform(self.square_button, 'square')
 
     def load_signal_from_file(self):
         """从文件加载信号数据并高亮按钮"""
         self.highlight_button(self.file_button)
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Signal File", "", "CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Signal File", "", WAVEFORM_FILE_FILTER)
         if file_path:
-            data = pd.read_csv(file_path, header=None).to_numpy().flatten()
-            self.signal_gen = SignalGenerator(signal_array=data)
-            self.waveform_selected = True
-
-    def update_output(self):
-        """更新信号输出值并实时显示"""
-        if self.signal_gen:
-            if self.signal_gen.cycle_count + self.signal_gen.index /  self.signal_gen.period>= self.signal_gen.total_cycles:
-                self.timer.stop()
-                self.output_active = False
-                self.start_button.setText("Start")
-                self.pause_button.setText("Pause")
-                self.pause_button.setEnabled(False)
+            # 文件不整体读入内存：后台线程边读边输出，大文件也可以立即开始
+            try:
+                stream = open_waveform_stream(file_path)
+            except (OSError, ValueError) as e:
+                print(f"Failed to open waveform file: {e}")
                 return
-
-            # 获取下一个信号值
-            new_value = self.signal_gen.next_value()
-            # 向硬件输出信号
-            write_data = [new_value]
-            ret = self.signal_gen.instantAo.writeAny(0, 1, None, write_data)
-            # 检查输出状态，输出失败时停止计时器
-            if BioFailed(ret):
-                print("Error: Failed to write data.")
-                self.timer.stop()
-            # 实时更新UI的绘图
-            self.update_plot(new_value)
+            if self.signal_gen is None:
+                self.signal_gen = SignalGenerator(signal_stream=stream)
+            else:
+                self.signal_gen.set_signal_stream(stream)
+            self.waveform_selected = True
 
 
 if __name__ == "__main__":
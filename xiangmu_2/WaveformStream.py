@@ -0,0 +1,184 @@
+import itertools
+import os
+import queue
+import threading
+
+import numpy as np
+
+WAVEFORM_FILE_FILTER = "Waveform Files (*.csv *.npy *.f32 *.bin);;All Files (*)"
+
+# 后台读线程每次读取的样本数，以及最多预读的块数：内存占用与文件大小无关
+STREAM_CHUNK_SAMPLES = 1 << 16
+READ_AHEAD_CHUNKS = 8
+# CSV 每次解析的行数
+CSV_CHUNK_LINES = 1 << 14
+
+# 读线程放入队列的一遍结束标记
+PASS_END = object()
+
+
+class ArrayWaveformSource:
+    """以 np.memmap 方式打开的波形文件，按块切片读取，长度已知"""
+
+    def __init__(self, values):
+        self.values = values
+        self.length = len(values)
+        if self.length == 0:
+            raise ValueError("Waveform file is empty.")
+
+    def iter_chunks(self):
+        for start in range(0, self.length, STREAM_CHUNK_SAMPLES):
+            yield np.asarray(self.values[start:start + STREAM_CHUNK_SAMPLES], dtype=np.float64)
+
+
+class CsvWaveformSource:
+    """不经 pandas 分块解析的 CSV 波形（无标题行，多列时按行展开）。
+
+    长度在第一遍读完后才知道，此前 length 为 None。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.length = None
+
+    def iter_chunks(self):
+        total = 0
+        with open(self.path, 'r') as f:
+            while True:
+                lines = list(itertools.islice(f, CSV_CHUNK_LINES))
+                if not lines:
+                    break
+                chunk = np.loadtxt(lines, delimiter=',', dtype=np.float64, ndmin=2).ravel()
+                total += len(chunk)
+                yield chunk
+        self.length = total
+
+
+def open_waveform_source(path):
+    """按扩展名打开波形文件：.npy 以 mmap 方式打开，.f32 / .bin 为原始
+    float32 / float64 小端数据，其余按 CSV 读取。
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        return ArrayWaveformSource(np.load(path, mmap_mode='r').ravel())
+    if ext == '.f32':
+        return ArrayWaveformSource(np.memmap(path, dtype='<f4', mode='r'))
+    if ext == '.bin':
+        return ArrayWaveformSource(np.memmap(path, dtype='<f8', mode='r'))
+    return CsvWaveformSource(path)
+
+
+class WaveformStream:
+    """从磁盘循环播放的自定义波形。
+
+    后台读线程按块顺序读取文件，最多预读 READ_AHEAD_CHUNKS 块放入队列，
+    读到文件末尾后从头开始下一遍；输出线程调用 next_chunk() 取样本。
+    第一块读入后即可开始输出，内存占用与文件大小无关。
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.cycle_count = 0  # 已完整输出的遍数
+        self.position = 0  # 当前一遍中已输出的样本数
+        self.buffer = np.empty(0)
+        self.buffer_pos = 0
+        self.closed = False
+        self.thread = None
+        self.start_reader()
+
+    def start_reader(self):
+        self.chunks = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.read_ahead, args=(self.chunks, self.stop_event), daemon=True)
+        self.thread.start()
+
+    def stop_reader(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def put(self, chunks, stop_event, item):
+        # 队列满时阻塞等待输出线程取走数据，同时响应停止请求
+        while not stop_event.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read_ahead(self, chunks, stop_event):
+        try:
+            while not stop_event.is_set():
+                count = 0
+                for chunk in self.source.iter_chunks():
+                    count += len(chunk)
+                    if not self.put(chunks, stop_event, chunk):
+                        return
+                if count == 0:
+                    raise ValueError("Waveform file is empty.")
+                if not self.put(chunks, stop_event, PASS_END):
+                    return
+        except Exception as e:
+            self.put(chunks, stop_event, e)
+
+    def next_item(self):
+        while True:
+            try:
+                item = self.chunks.get(timeout=0.1)
+            except queue.Empty:
+                if self.closed:
+                    return None
+                continue
+            if isinstance(item, Exception):
+                raise IOError(f"Failed to read waveform file: {item}")
+            return item
+
+    def samples_until(self, total_cycles):
+        """输出到第 total_cycles 遍结束还需要的样本数，长度未知时为无穷大"""
+        length = self.source.length
+        if total_cycles == float('inf') or length is None:
+            return float('inf')
+        return max(int(np.ceil(total_cycles * length)) - (self.cycle_count * length + self.position), 0)
+
+    def next_chunk(self, count, total_cycles=float('inf')):
+        """按顺序取出最多 count 个样本（跨遍循环），达到 total_cycles 时截断"""
+        parts = []
+        count = min(count, self.samples_until(total_cycles))
+        while count > 0 and self.cycle_count < total_cycles:
+            if self.buffer_pos >= len(self.buffer):
+                item = self.next_item()
+                if item is None:
+                    break
+                if item is PASS_END:
+                    self.cycle_count += 1
+                    self.position = 0
+                    count = min(count, self.samples_until(total_cycles))
+                    continue
+                self.buffer = item
+                self.buffer_pos = 0
+                continue
+            n = int(min(count, len(self.buffer) - self.buffer_pos))
+            parts.append(self.buffer[self.buffer_pos:self.buffer_pos + n])
+            self.buffer_pos += n
+            self.position += n
+            count -= n
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def rewind(self):
+        """回到文件开头重新播放（输出停止时调用）"""
+        self.stop_reader()
+        self.cycle_count = 0
+        self.position = 0
+        self.buffer = np.empty(0)
+        self.buffer_pos = 0
+        self.start_reader()
+
+    def close(self):
+        self.closed = True
+        self.stop_reader()
+
+
+def open_waveform_stream(path):
+    return WaveformStream(open_waveform_source(path))
@@ -6,15 +6,13 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QSpinBox,
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QSlider, QLineEdit, QFormLayout, QMessageBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt
-from Automation.BDaq.InstantDoCtrl import InstantDoCtrl
-from Automation.BDaq.InstantDiCtrl import InstantDiCtrl
-
-from Automation.BDaq.BDaqApi import BioFailed
+from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from threading import Lock
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from common.DisplayScheduler import get_display_scheduler
+from common.StripChart import create_strip_chart
 
 deviceDescription = "USB-4704,BID#0"
 profilePath = "../../profile/DemoDevice.xml"
@@ -91,6 +89,9 @@ class DOThread(QThread):
         self.running = False
 
     def run(self):
+        # 设备驱动在线程中按需导入和打开，导入本模块不会访问硬件
+        from Automation.BDaq.InstantDoCtrl import InstantDoCtrl
+        from Automation.BDaq.BDaqApi import BioFailed
         instantDoCtrl = InstantDoCtrl(deviceDescription)
         instantDoCtrl.loadProfile = profilePath
         try:
@@ -390,6 +391,8 @@ class DIThread(QThread):
         self.running = False
 
     def run(self):
+        from Automation.BDaq.InstantDiCtrl import InstantDiCtrl
+        from Automation.BDaq.BDaqApi import BioFailed
         instantDiCtrl = InstantDiCtrl(deviceDescription)
         instantDiCtrl.loadProfile = profilePath
         try:
@@ -411,7 +414,7 @@ class DIThread(QThread):
 
 
 class DI_Tab(QWidget):
-    def __init__(self):
+    def __init__(self, plot_backend=None):
         super().__init__()
         self.layout = QVBoxLayout()
 
@@ -422,18 +425,10 @@ class DI_Tab(QWidget):
 
         # 图形显示区
         self.plot_label = QLabel("Voltage vs Time Plot:")
-        self.figure = Figure(figsize=(5, 3))
-        self.canvas = FigureCanvas(self.figure)
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_title("Voltage vs Time")
-        self.ax.set_xlabel("Time (s)")
-        self.ax.set_ylabel("Voltage (V)")
-        self.ax.set_ylim(0, 3)
-        self.ax.grid(True)
-
-        # 创建用于动态更新的Line2D对象
-        self.line, = self.ax.plot([], [], label="Voltage", color="blue")
-        self.ax.legend()
+        # plot_backend 为 'matplotlib' 或 'qpainter'，保留最长可选的 10 秒数据
+        self.chart = create_strip_chart(plot_backend, self, window=10, ylim=(0, 3), history=10,
+                                        title="Voltage vs Time", xlabel="Time (s)", ylabel="Voltage (V)",
+                                        label="Voltage")
 
         # 滑条控制区
         self.slider_label = QLabel("X-Axis Range (s):")
@@ -470,7 +465,7 @@ class DI_Tab(QWidget):
         self.layout.addWidget(self.status_label)
         self.layout.addWidget(self.status_log)
         self.layout.addWidget(self.plot_label)
-        self.layout.addWidget(self.canvas)
+        self.layout.addWidget(self.chart)
 
         # 滑条布局
         slider_layout = QHBoxLayout()
@@ -482,19 +477,15 @@ class DI_Tab(QWidget):
         self.layout.addLayout(button_layout)
         self.setLayout(self.layout)
 
-        # 数据存储
-        self.time_data = []
-        self.voltage_data = []
+        # 第一个样本的时刻，之后的时间归一化到从0开始
+        self.start_time = None
 
         # 线程处理
         self.thread = DIThread()
         self.thread.data_signal.connect(self.handle_thread_data)
         self.thread.start()  # 启动线程
 
-        # 定时器定期刷新绘图
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_plot)
-        self.timer.start(10)  # 每 10 毫秒刷新一次
+        # 只有收到新数据时才标记重绘，由显示调度器按帧率绘制，标签页不可见时跳过
 
     def handle_thread_data(self, value):
         """处理线程信号，仅在线程运行时调用process_data"""
@@ -523,30 +514,27 @@ class DI_Tab(QWidget):
         # 记录电压值和时间
         voltage = voltage_bits
         current_time = time.time()
-        if len(self.time_data) > 0:
-            current_time -= self.time_data[0]  # 时间归一化到从0开始
+        if self.start_time is None:
+            self.start_time = current_time
+        current_time -= self.start_time  # 时间归一化到从0开始
 
-        self.time_data.append(current_time)
-        self.voltage_data.append(voltage)
+        self.chart.append([current_time], [voltage])
 
         # 更新日志
         self.status_log.append(f"Data: {value:08b} | Voltage: {voltage} V | Time: {current_time:.2f} s")
+        get_display_scheduler().mark_dirty(self)
+
+    def render_frame(self):
+        self.update_plot()
 
     def update_plot(self):
         """高效更新绘图"""
-        if len(self.time_data) > 0:
-            x_range = self.x_axis_slider.value() / 10  # 获取滑条设定的范围
-            x_min = max(0, self.time_data[-1] - x_range)
-            x_max = self.time_data[-1]
-
-            self.line.set_data(self.time_data, self.voltage_data)
-            self.ax.set_xlim(x_min, x_max)
-
-        self.canvas.draw()
+        self.chart.set_window(self.x_axis_slider.value() / 10)  # 获取滑条设定的范围
+        self.chart.refresh()
 
     def update_x_axis_range(self, value):
         """更新横轴显示范围"""
-        self.update_plot()
+        get_display_scheduler().mark_dirty(self)
 
     def get_button_style(self, active):
         if active: